@@ -0,0 +1,100 @@
+# 자주 쓰는 조회 문장의 SQLAlchemy 오버헤드 벤치마크
+# 1) DB 없이: 호출마다 select() 생성 + 캐시 키 계산 vs 미리 만든 문장(bindparam) vs lambda_stmt, 그리고 캐시 실패 시 컴파일 비용
+# 2) 개발용 DB에서: 요청 흐름(find_by_subject_name, find_session_by_id, find_datas_by_session_id)을 반복 실행한 뒤 컴파일 캐시 통계
+# 실행: python -m benchmarks.compiled_statements
+import asyncio
+import time
+
+from sqlalchemy import lambda_stmt
+from sqlalchemy.dialects import mysql
+from sqlalchemy.future import select
+
+from benchmarks.fixtures import create_fixture_session, drop_fixture
+from database import compiled_cache_counts, compiled_cache_stats
+from study.application.study_service import StudyService
+from study.infra.db_models.study_db import StudyData as Data_db
+from study.infra.db_models.study_db import StudySession as Session_db
+from study.infra.db_models.study_db import Subject as SubjectDB
+from study.infra.repository.study_repo import StudyRepository, _statements
+
+REPEAT = 10_000
+DB_REPEAT = 500
+
+dialect = mysql.dialect()
+statements = _statements(True)
+
+
+# 변경 전: 호출마다 문장을 새로 만든다.
+def session_by_id_rebuilt(user_id, session_id):
+    return select(Session_db).where(Session_db.user_id == user_id, Session_db.id == session_id)
+
+
+def datas_by_session_rebuilt(user_id, session_id):
+    return (
+        select(Data_db)
+        .join(Session_db)
+        .where(Session_db.user_id == user_id, Data_db.session_id == session_id)
+        .order_by(Data_db.time)
+    )
+
+
+def subject_by_name_rebuilt(user_id, subject_name):
+    return select(SubjectDB).where(SubjectDB.user_id == user_id, SubjectDB.subject_name == subject_name)
+
+
+def session_by_id_lambda(user_id, session_id):
+    return lambda_stmt(lambda: select(Session_db).where(Session_db.user_id == user_id, Session_db.id == session_id))
+
+
+def per_call_us(call) -> float:
+    started = time.perf_counter()
+    for i in range(REPEAT):
+        call(i)
+    return (time.perf_counter() - started) / REPEAT * 1_000_000
+
+
+def statement_overhead():
+    # 실행할 때마다 Session.execute가 하는 일: (문장 생성) + 캐시 키 계산 -> 캐시 적중 시 컴파일 생략
+    cases = [
+        ("session by id", session_by_id_rebuilt, statements.session_by_id),
+        ("datas by session", datas_by_session_rebuilt, statements.datas_by_session),
+        ("subject by name", subject_by_name_rebuilt, statements.subject_by_name),
+    ]
+    print(f"{'query':<18} {'rebuilt us':>11} {'prebuilt us':>12} {'compile us':>11}")
+    for name, rebuild, prebuilt in cases:
+        rebuilt = per_call_us(lambda i: rebuild(f"user-{i}", f"id-{i}")._generate_cache_key())
+        cached = per_call_us(lambda i: prebuilt._generate_cache_key())
+        compiled = per_call_us(lambda i: rebuild(f"user-{i}", f"id-{i}").compile(dialect=dialect))
+        print(f"{name:<18} {rebuilt:>11.1f} {cached:>12.1f} {compiled:>11.1f}")
+
+    lambda_us = per_call_us(lambda i: session_by_id_lambda(f"user-{i}", f"id-{i}")._generate_cache_key())
+    print(f"{'session by id':<18} lambda_stmt {lambda_us:.1f} us")
+
+
+async def cache_stats():
+    user_id, session_id = await create_fixture_session()
+    repo = StudyRepository()
+
+    try:
+        subject = await StudyService(study_repo = repo).create_subject(user_id = user_id, subject_name = user_id[-10:])
+
+        compiled_cache_counts.clear()
+        started = time.perf_counter()
+        for _ in range(DB_REPEAT):
+            await repo.find_by_subject_name(user_id, subject.subject_name)
+            await repo.find_session_by_id(user_id, session_id)
+            await repo.find_datas_by_session_id(user_id, session_id)
+        elapsed = (time.perf_counter() - started) / DB_REPEAT * 1000
+        print(f"request flow (3 queries): {elapsed:.3f} ms")
+        print(f"compiled cache: {compiled_cache_stats()}")
+    finally:
+        await drop_fixture(user_id)
+
+
+async def main():
+    statement_overhead()
+    await cache_stats()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+# 벤치마크용 임시 유저/세션 생성 및 정리
+# 실제 데이터베이스(database.SQLALCHEMY_DATABASE_URL)에 연결하므로 개발용 DB에서만 실행한다.
+from datetime import datetime
+from sqlalchemy import delete
+from ulid import ULID
+
+from database import AsyncSessionLocal, async_engine, init_db
+import database_models  # noqa: F401  (모든 테이블을 메타데이터에 등록)
+from study.domain.study import StudyData
+from study.infra.db_models.study_db import StudySession as Session_db
+from user.infra.db_models.user import User
+
+ulid = ULID()
+
+# SQL 로그 출력이 측정값을 왜곡하지 않도록 끈다.
+async_engine.sync_engine.echo = False
+
+
+async def create_fixture_session() -> tuple[str, str]:
+    await init_db()
+    now = datetime.now()
+    user_id = ulid.generate()
+    session_id = ulid.generate()
+
+    async with AsyncSessionLocal() as db:
+        db.add(User(
+            id = user_id,
+            name = "bench",
+            email = f"bench-{user_id}@bench.local",
+            password = "-",
+            memo = None,
+            created_at = now,
+            updated_at = now,
+        ))
+        await db.flush()
+        db.add(Session_db(
+            id = session_id,
+            user_id = user_id,
+            subject = "bench",
+            start_time = now.isoformat(),
+            created_at = now,
+            updated_at = now,
+        ))
+        await db.commit()
+
+    return user_id, session_id
+
+
+async def drop_fixture(user_id: str):
+    # User 삭제 시 StudySession, StudyData는 FK CASCADE로 함께 삭제된다.
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+def make_datas(session_id: str, count: int) -> list[StudyData]:
+    now = datetime.now()
+    return [
+        StudyData(
+            id = ulid.generate(),
+            session_id = session_id,
+            ppg_value = 0.5 + i % 100 / 1000,
+            focus_score = i % 100 / 100,
+            time = now,
+            created_at = now,
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,124 @@
+# 조회 행 -> 도메인 객체 변환 벤치마크 (StudyData 10k 행)
+# - 변경 전: ORM 객체 조회 + 행마다 inspect(row).mapper.iterate_properties, datetime -> ISO 문자열, Decimal 유지
+# - 변경 후: Core 행 튜플 + RowMapper(컬럼 목록 미리 계산), slots dataclass, float fetch
+# 실제 데이터베이스에 연결하므로 개발용 DB에서만 실행한다.
+# 실행: python -m benchmarks.row_mapping
+import asyncio
+import time
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect, insert
+from sqlalchemy.future import select
+from sqlalchemy.orm import ColumnProperty
+
+from benchmarks.fixtures import create_fixture_session, drop_fixture, ulid
+from database import AsyncSessionLocal
+from study.domain.study import StudyData
+from study.infra.db_models.study_db import StudyData as Data_db
+from study.infra.repository.study_repo import StudyRepository
+from utils.db_utils import RowMapper
+
+ROWS = 10_000
+REPEAT = 10
+
+# slots 없는 같은 모양의 dataclass (메모리 비교용)
+StudyDataDict = make_dataclass("StudyDataDict", [field.name for field in fields(StudyData)])
+
+
+# 변경 전 row_to_dict (ORM 모델 인스턴스 분기)
+def row_to_dict_old(row) -> dict:
+    result = {}
+    for prop in inspect(row).mapper.iterate_properties:
+        if isinstance(prop, ColumnProperty):
+            value = getattr(row, prop.key)
+            if isinstance(value, datetime):
+                result[prop.key] = value.isoformat()
+            else:
+                result[prop.key] = value
+    return result
+
+
+async def seed(session_id: str):
+    now = datetime.now()
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Data_db.__table__), [
+            {
+                "id": ulid.generate(),
+                "session_id": session_id,
+                "ppg_value": 0.5 + i % 100 / 1000,
+                "focus_score": i % 100 / 100,
+                "time": now + timedelta(milliseconds=i),
+                "created_at": now,
+            }
+            for i in range(ROWS)
+        ])
+        await db.commit()
+
+
+async def find_datas_old(session_id: str) -> list[StudyData]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Data_db).where(Data_db.session_id == session_id).order_by(Data_db.time))
+        return [StudyData(**row_to_dict_old(data)) for data in result.scalars().all()]
+
+
+async def measure(call) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        await call()
+    return (time.perf_counter() - started) / REPEAT * 1000
+
+
+def measure_sync(call) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        call()
+    return (time.perf_counter() - started) / REPEAT * 1000
+
+
+def peak_kb(build) -> float:
+    tracemalloc.start()
+    objects = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return peak / 1024
+
+
+async def main():
+    user_id, session_id = await create_fixture_session()
+    float_repo = StudyRepository(float_fetch = True)
+    decimal_repo = StudyRepository(float_fetch = False)
+    mapper = RowMapper(StudyData, Data_db)
+
+    try:
+        await seed(session_id)
+
+        # 조회 + 변환 전체
+        old = await measure(lambda: find_datas_old(session_id))
+        decimal = await measure(lambda: decimal_repo.find_datas_by_session_id(user_id, session_id))
+        new = await measure(lambda: float_repo.find_datas_by_session_id(user_id, session_id))
+        print(f"find_datas_by_session_id ({ROWS:,} rows)")
+        print(f"  before (ORM + row_to_dict)     {old:8.2f} ms")
+        print(f"  after  (RowMapper, Decimal)    {decimal:8.2f} ms ({old / decimal:.1f}x)")
+        print(f"  after  (RowMapper, float)      {new:8.2f} ms ({old / new:.1f}x)")
+
+        # 변환만 (같은 행을 한 번 읽어 두고 도메인 객체로 바꾸는 시간)
+        async with AsyncSessionLocal() as db:
+            orm_rows = (await db.execute(select(Data_db).where(Data_db.session_id == session_id))).scalars().all()
+            core_rows = (await db.execute(select(*mapper.columns).where(Data_db.session_id == session_id))).all()
+        old = measure_sync(lambda: [StudyData(**row_to_dict_old(data)) for data in orm_rows])
+        new = measure_sync(lambda: mapper.all(core_rows))
+        print(f"mapping only: before {old:.2f} ms, after {new:.2f} ms ({old / new:.1f}x)")
+
+        # 객체 메모리 (slots 유무)
+        plain = peak_kb(lambda: [StudyDataDict(*row) for row in core_rows])
+        slotted = peak_kb(lambda: mapper.all(core_rows))
+        print(f"memory for {ROWS:,} objects: dict dataclass {plain:,.0f} KiB, slots dataclass {slotted:,.0f} KiB")
+    finally:
+        await drop_fixture(user_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+# 집중도 데이터 저장 벤치마크: ORM add_all vs Core INSERT executemany
+# 실행: python -m benchmarks.save_data
+import asyncio
+import time
+
+from benchmarks.fixtures import create_fixture_session, drop_fixture, make_datas
+from database import AsyncSessionLocal
+from study.infra.db_models.study_db import StudyData as Data_db
+from study.infra.repository.study_repo import StudyRepository
+
+SIZES = [100, 1_000, 10_000]
+
+
+# 변경 전 방식: 샘플마다 ORM 객체를 만들어 add_all
+async def save_data_orm(datas):
+    async with AsyncSessionLocal() as db:
+        db.add_all([
+            Data_db(
+                id = data.id,
+                session_id = data.session_id,
+                ppg_value = data.ppg_value,
+                focus_score = data.focus_score,
+                time = data.time,
+                created_at = data.created_at
+            )
+            for data in datas
+        ])
+        await db.commit()
+
+
+async def measure(save, session_id: str, size: int) -> float:
+    datas = make_datas(session_id, size)
+    started = time.perf_counter()
+    await save(datas)
+    return size / (time.perf_counter() - started)
+
+
+async def main():
+    user_id, session_id = await create_fixture_session()
+    repo = StudyRepository()
+
+    try:
+        print(f"{'rows':>8} {'orm rows/s':>14} {'core rows/s':>14} {'speedup':>8}")
+        for size in SIZES:
+            orm = await measure(save_data_orm, session_id, size)
+            core = await measure(lambda datas: repo.save_data(user_id, datas), session_id, size)
+            print(f"{size:>8} {orm:>14,.0f} {core:>14,.0f} {core / orm:>7.1f}x")
+    finally:
+        await drop_fixture(user_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+# 조회 응답 직렬화 벤치마크: asdict + 응답 모델 검증 + JSONResponse vs FastJSONResponse(trusted output, orjson)
+# DB 없이 도메인 객체만으로 측정한다.
+# 실행: python -m benchmarks.serialization
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+
+from benchmarks.fixtures import make_datas
+from common.responses import FastJSONResponse
+from study.domain.study import StudySession
+from study.interface.controllers.study_controller import GetDataResponse, GetSessionResponse
+
+SIZES = [10, 100, 10_000]
+REPEAT = 20
+
+
+def make_sessions(count: int) -> list[StudySession]:
+    now = datetime.now()
+    return [
+        StudySession(
+            id = f"BENCH{index:021d}",
+            user_id = "BENCHUSER",
+            subject_id = "BENCHSUBJECT",
+            subject = "bench",
+            avg_focus = 0.5,
+            ai_avg_focus = 0.5,
+            start_time = now.isoformat(),
+            end_time = (now + timedelta(hours=1)).isoformat(),
+            created_at = now,
+            updated_at = now,
+        )
+        for index in range(count)
+    ]
+
+
+# 변경 전 방식: asdict -> response_model 검증 -> model_dump(mode="json") -> 표준 json 직렬화
+def render_validated(model, key: str, items: list) -> bytes:
+    content = {key: [asdict(item) for item in items]}
+    if key == "sessions":
+        content.update(total_count=len(items), page=1)
+    validated = model.model_validate(content)
+    return JSONResponse(validated.model_dump(mode="json")).body
+
+
+def render_trusted(key: str, items: list) -> bytes:
+    content = {key: items}
+    if key == "sessions":
+        content.update(total_count=len(items), page=1)
+    return FastJSONResponse(content).body
+
+
+def measure(render) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        render()
+    return (time.perf_counter() - started) / REPEAT * 1000
+
+
+def main():
+    print(f"{'kind':>9} {'items':>7} {'validated ms':>13} {'trusted ms':>11} {'speedup':>8}")
+    for size in SIZES:
+        cases = [
+            ("datas", GetDataResponse, make_datas("BENCHSESSION", size)),
+            ("sessions", GetSessionResponse, make_sessions(size)),
+        ]
+        for key, model, items in cases:
+            validated = measure(lambda: render_validated(model, key, items))
+            trusted = measure(lambda: render_trusted(key, items))
+            print(f"{key:>9} {size:>7} {validated:>13.3f} {trusted:>11.3f} {validated / trusted:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# 날짜별 세션 조회 벤치마크: func.date(created_at) 비교 vs 반열린 범위 비교 + DISTINCT vs 날짜별 요약 테이블
+# 1M개의 세션(유저 1,000명 x 1,000개, 최근 1년에 분산)을 만들어 EXPLAIN 결과와 실행 시간을 비교한다.
+# 실제 데이터베이스에 연결하므로 개발용 DB에서만 실행한다. (ix_studysession_user_created 마이그레이션 적용 후)
+# 실행: python -m benchmarks.session_dates
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, text
+from ulid import ULID
+
+import benchmarks.fixtures  # noqa: F401  (SQL 로그 끄기, 모든 테이블 등록)
+from database import AsyncSessionLocal, init_db
+from study.infra.db_models.study_db import StudySession as Session_db
+from study.infra.repository.study_repo import StudyRepository
+from user.infra.db_models.user import User
+
+USERS = 1_000
+SESSIONS_PER_USER = 1_000
+INSERT_CHUNK = 10_000
+REPEAT = 20
+BENCH_EMAIL = "bench-dates-{index}@bench.local"
+
+ulid = ULID()
+
+OLD_DATES_SQL = "SELECT DATE(created_at) FROM StudySession WHERE user_id = :user_id"
+NEW_DATES_SQL = (
+    "SELECT DISTINCT DATE(created_at) AS d FROM StudySession WHERE user_id = :user_id ORDER BY d"
+)
+SUMMARY_DATES_SQL = (
+    "SELECT date FROM StudyDailySummary WHERE user_id = :user_id AND session_count > 0 ORDER BY date"
+)
+OLD_BY_DATE_SQL = "SELECT * FROM StudySession WHERE user_id = :user_id AND DATE(created_at) = :date"
+NEW_BY_DATE_SQL = (
+    "SELECT * FROM StudySession WHERE user_id = :user_id "
+    "AND created_at >= :start AND created_at < :end ORDER BY created_at"
+)
+
+
+async def seed() -> list[str]:
+    await init_db()
+    now = datetime.now()
+    user_ids = [ulid.generate() for _ in range(USERS)]
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(User.__table__), [
+            {
+                "id": user_id,
+                "name": "bench",
+                "email": BENCH_EMAIL.format(index=index),
+                "password": "-",
+                "memo": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for index, user_id in enumerate(user_ids)
+        ])
+
+        rows = []
+        for user_id in user_ids:
+            for _ in range(SESSIONS_PER_USER):
+                created_at = now - timedelta(seconds=random.randrange(365 * 24 * 3600))
+                rows.append({
+                    "id": ulid.generate(),
+                    "user_id": user_id,
+                    "subject": "bench",
+                    "start_time": created_at.isoformat(),
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+                if len(rows) >= INSERT_CHUNK:
+                    await db.execute(insert(Session_db.__table__), rows)
+                    rows = []
+        if rows:
+            await db.execute(insert(Session_db.__table__), rows)
+        await db.commit()
+
+    return user_ids
+
+
+async def drop():
+    # StudySession은 FK CASCADE로 함께 삭제된다.
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.email.like(BENCH_EMAIL.format(index="%"))))
+        await db.commit()
+
+
+async def explain(sql: str, params: dict):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(text("EXPLAIN " + sql), params)
+        for row in result.mappings():
+            print(f"    type={row['type']} key={row['key']} rows={row['rows']} extra={row['Extra']}")
+
+
+async def measure_sql(sql: str, params: dict) -> float:
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            (await db.execute(text(sql), params)).all()
+        return (time.perf_counter() - started) / REPEAT * 1000
+
+
+async def measure(call) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        await call()
+    return (time.perf_counter() - started) / REPEAT * 1000
+
+
+# 변경 전 get_session_dates: 모든 세션의 날짜를 가져와 리스트 포함 검사로 중복 제거 (O(n²))
+async def session_dates_old(user_id: str) -> list[str]:
+    async with AsyncSessionLocal() as db:
+        dates = (await db.execute(text(OLD_DATES_SQL), {"user_id": user_id})).scalars().all()
+    res_date = []
+    for date in dates:
+        if str(date) in res_date:
+            continue
+        res_date.append(str(date))
+    return res_date
+
+
+async def main():
+    repo = StudyRepository()
+    date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    start = datetime.strptime(date, "%Y-%m-%d")
+
+    try:
+        user_id = random.choice(await seed())
+        await repo.rebuild_daily_summaries(user_id)
+        range_params = {"user_id": user_id, "start": start, "end": start + timedelta(days=1)}
+        print(f"StudySession rows: {USERS * SESSIONS_PER_USER:,}")
+        for name, sql, params in [
+            ("dates (before)", OLD_DATES_SQL, {"user_id": user_id}),
+            ("dates (distinct)", NEW_DATES_SQL, {"user_id": user_id}),
+            ("dates (summary)", SUMMARY_DATES_SQL, {"user_id": user_id}),
+            ("by date (before)", OLD_BY_DATE_SQL, {"user_id": user_id, "date": date}),
+            ("by date (after)", NEW_BY_DATE_SQL, range_params),
+        ]:
+            print(f"{name}: {await measure_sql(sql, params):.3f} ms")
+            await explain(sql, params)
+
+        old = await measure(lambda: session_dates_old(user_id))
+        new = await measure(lambda: repo.get_session_dates(user_id))
+        print(f"get_session_dates end-to-end: before {old:.3f} ms, after {new:.3f} ms ({old / new:.1f}x)")
+    finally:
+        await drop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+# 샘플 id 발급/행 생성 마이크로 벤치마크: 샘플별 ULID().generate() + StudyData vs ULIDAllocator + StudyDataColumns
+# DB 없이 실행된다. 실행: python -m benchmarks.ulid_allocation
+import timeit
+from collections import namedtuple
+from datetime import datetime
+
+from ulid import ULID
+
+from study.domain.study import StudyData, StudyDataColumns
+from utils.ulid_allocator import ulid_allocator
+
+SIZES = [100, 1_000, 10_000]
+SingleData = namedtuple("SingleData", ["ppg_value", "focus_score", "time"])
+ulid = ULID()
+
+
+# 변경 전 StudyService.create_data의 반복문
+def build_loop(session_id, datas, now):
+    return [
+        StudyData(
+            id = ulid.generate(),
+            session_id = session_id,
+            ppg_value = data.ppg_value,
+            focus_score = data.focus_score,
+            time = data.time,
+            created_at = now
+        )
+        for data in datas
+    ]
+
+
+def build_columns(session_id, datas, now):
+    return StudyDataColumns(
+        session_id = session_id,
+        ids = ulid_allocator.allocate(len(datas)),
+        ppg_values = [data.ppg_value for data in datas],
+        focus_scores = [data.focus_score for data in datas],
+        times = [data.time for data in datas],
+        created_at = now,
+    ).rows()
+
+
+def main():
+    now = datetime.now()
+    print(f"{'samples':>8} {'loop ms':>10} {'columns ms':>11} {'speedup':>8}")
+    for size in SIZES:
+        datas = [SingleData(0.5, i % 100 / 100, now) for i in range(size)]
+        repeat = max(1, 20_000 // size)
+        loop = timeit.timeit(lambda: build_loop("session", datas, now), number=repeat) / repeat * 1000
+        columns = timeit.timeit(lambda: build_columns("session", datas, now), number=repeat) / repeat * 1000
+        print(f"{size:>8} {loop:>10.2f} {columns:>11.2f} {loop / columns:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
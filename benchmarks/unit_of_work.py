@@ -0,0 +1,72 @@
+# 요청당 커넥션 풀 checkout 횟수 벤치마크: 저장소 호출마다 세션 생성 vs 요청 단위 작업(UnitOfWork)
+# create_session(과목 조회 + 세션 저장), complete_session(세션 조회 + 수정)을 각각 REPEAT번 실행해
+# 요청 하나당 풀에서 커넥션을 가져온 횟수와 평균 시간을 비교한다.
+# 실제 데이터베이스에 연결하므로 개발용 DB에서만 실행한다.
+# 실행: python -m benchmarks.unit_of_work
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import event
+
+from benchmarks.fixtures import create_fixture_session, drop_fixture
+from database import UnitOfWork, async_engine
+from study.application.study_service import StudyService
+from study.infra.repository.study_repo import StudyRepository
+
+REPEAT = 200
+
+checkouts = 0
+
+
+@event.listens_for(async_engine.sync_engine, "checkout")
+def count_checkout(dbapi_connection, connection_record, connection_proxy):
+    global checkouts
+    checkouts += 1
+
+
+# 요청 하나 = UnitOfWorkMiddleware가 하는 것처럼 UnitOfWork 범위 안에서 서비스 메서드 한 번 호출
+async def measure(call, unit_of_work: bool) -> tuple[float, float]:
+    global checkouts
+    checkouts = 0
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        if unit_of_work:
+            async with UnitOfWork():
+                await call()
+        else:
+            await call()
+    elapsed = (time.perf_counter() - started) / REPEAT * 1000
+    return checkouts / REPEAT, elapsed
+
+
+async def main():
+    service = StudyService(study_repo = StudyRepository())
+    user_id, _ = await create_fixture_session()
+
+    try:
+        subject = await service.create_subject(user_id = user_id, subject_name = uuid.uuid4().hex[:10])
+        start_time = datetime.now().isoformat()
+
+        async def create_session():
+            return await service.create_session(user_id = user_id, subject = subject.subject_name, start_time = start_time)
+
+        session = await create_session()
+
+        async def complete_session():
+            return await service.complete_session(id = session.id, user_id = user_id, end_time = datetime.now().isoformat(), avg_focus = 0.5)
+
+        for name, call in [("create_session", create_session), ("complete_session", complete_session)]:
+            before, before_ms = await measure(call, unit_of_work = False)
+            after, after_ms = await measure(call, unit_of_work = True)
+            print(
+                f"{name}: checkouts/request before {before:.1f}, after {after:.1f} | "
+                f"{before_ms:.3f} ms -> {after_ms:.3f} ms"
+            )
+    finally:
+        await drop_fixture(user_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
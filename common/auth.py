@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from fastapi.security import OAuth2PasswordBearer
 from typing import Annotated
 from datetime import datetime, timedelta
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, WebSocket, WebSocketException, status
 from jose import JWTError, jwt
 from enum import StrEnum
 from config import get_settings
@@ -67,6 +67,27 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
     
     return CurrentUser(user_id, Role(role))
 
+# 웹소켓은 연결 시 한 번만 인증한다. 헤더를 보낼 수 없는 클라이언트는 쿼리 파라미터(token)를 사용한다.
+async def get_current_user_ws(websocket: WebSocket, token: str | None = None):
+    if not token:
+        scheme, _, token = websocket.headers.get("Authorization", "").partition(" ")
+        if scheme != "Bearer":
+            token = None
+    if not token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+
+    try:
+        payload = await decode_access_token(token)
+    except HTTPException:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+
+    user_id = payload.get("user_id")
+    role = payload.get("role")
+    if not user_id or not role or role != Role.USER:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+
+    return CurrentUser(user_id, Role(role))
+
 # def get_admin_user(token: Annotated[str, Depends(oauth2_scheme)]):
 #     payload = decode_access_token(token)
 
@@ -0,0 +1,266 @@
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import zstandard
+
+
+# 본문을 푸는 중의 오류. 앱의 본문 읽기(FastAPI 요청 본문 파싱 등)를 거치면 다른 응답으로 바뀔 수 있으므로
+# 예외를 앱으로 올리지 않고 미들웨어가 이 상태 코드로 직접 응답한다.
+class DecompressionError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class BodyTooLarge(DecompressionError):
+    def __init__(self):
+        super().__init__(413, "Decompressed body too large")
+
+
+# 압축 데이터가 깨졌거나 중간에 끊긴 경우 (500 대신 400)
+class InvalidCompressedBody(DecompressionError):
+    def __init__(self):
+        super().__init__(400, "Invalid compressed body")
+
+
+# 요청 본문 해제기. 청크 단위로 풀되 한 번에 limit 바이트를 넘게 풀지 않는다. (넘으면 BodyTooLarge)
+class _GzipDecoder:
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(wbits=31)
+
+    def decompress(self, data: bytes, limit: int) -> bytes:
+        # 한도 + 1 바이트까지만 푼다. 출력이 한도를 넘으면 나머지 입력은 unconsumed_tail에 남은 채로 거절하고,
+        # 한도 안이면 입력을 모두 소비한 것이므로 다음 청크로 넘어갈 때 남는 입력이 없다.
+        try:
+            body = self._decompressor.decompress(data, limit + 1)
+        except zlib.error:
+            raise InvalidCompressedBody()
+        if len(body) > limit:
+            raise BodyTooLarge()
+        return body
+
+    def finish(self):
+        if not self._decompressor.eof:
+            raise InvalidCompressedBody()
+
+
+class _LimitedSink:
+    def __init__(self):
+        self.limit = 0
+        self.chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.size > self.limit:
+            raise BodyTooLarge()
+        self.chunks.append(data)
+        return len(data)
+
+    def take(self) -> bytes:
+        body = b"".join(self.chunks)
+        self.chunks, self.size = [], 0
+        return body
+
+
+class _ZstdDecoder:
+    # decompressobj는 출력 크기 제한이 없으므로 stream_writer가 write_size 단위로 내보내는 출력을 세다가 한도를 넘으면 멈춘다.
+    def __init__(self):
+        self._sink = _LimitedSink()
+        self._writer = zstandard.ZstdDecompressor().stream_writer(self._sink, write_size=64 * 1024)
+
+    def decompress(self, data: bytes, limit: int) -> bytes:
+        self._sink.limit = limit
+        try:
+            self._writer.write(data)
+        except zstandard.ZstdError:
+            raise InvalidCompressedBody()
+        return self._sink.take()
+
+    def finish(self):
+        pass
+
+
+def _decompressor(encoding: str):
+    if encoding == "gzip":
+        return _GzipDecoder()
+    if encoding == "zstd":
+        return _ZstdDecoder()
+    return None
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, more: bool) -> bytes:
+        flush_mode = zlib.Z_SYNC_FLUSH if more else zlib.Z_FINISH
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, more: bool) -> bytes:
+        flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK if more else zstandard.COMPRESSOBJ_FLUSH_FINISH
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    - 요청: Content-Encoding이 gzip/zstd인 본문을 청크 단위로 풀어서 앱에 넘긴다.
+      풀린 크기가 max_body_size를 넘으면 413, 압축 데이터가 깨졌으면 400, 지원하지 않는 인코딩이면 415로 응답한다.
+    - 응답: Accept-Encoding에 따라 zstd > gzip 순으로 골라 minimum_size 이상인 본문만 압축한다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        level: int = 6,
+        max_body_size: int = 10 * 1024 * 1024,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "identity").strip().lower()
+        if content_encoding not in ("", "identity"):
+            decompressor = _decompressor(content_encoding)
+            if decompressor is None:
+                response = PlainTextResponse("Unsupported Content-Encoding", status_code=415)
+                await response(scope, receive, send)
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (key, value) for key, value in scope["headers"]
+                if key not in (b"content-encoding", b"content-length")
+            ]
+        send = self._compressing_send(send, _accepted_encodings(headers.get("accept-encoding", "")))
+        if content_encoding not in ("", "identity"):
+            await self._call_decompressing(scope, receive, send, decompressor)
+        else:
+            await self.app(scope, receive, send)
+
+    # 본문을 풀다 실패하면 앱에는 연결이 끊긴 것으로 알리고, 앱의 응답은 버린 뒤 413/400을 직접 보낸다.
+    async def _call_decompressing(self, scope: Scope, receive: Receive, send: Send, decompressor):
+        failure: DecompressionError | None = None
+        started = False
+        total = 0
+
+        async def wrapped_receive() -> Message:
+            nonlocal failure, total
+            if failure is not None:
+                return {"type": "http.disconnect"}
+
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+
+            try:
+                body = decompressor.decompress(message.get("body", b""), self.max_body_size - total)
+                more_body = message.get("more_body", False)
+                if not more_body:
+                    decompressor.finish()
+            except DecompressionError as e:
+                failure = e
+                return {"type": "http.disconnect"}
+
+            total += len(body)
+            return {"type": "http.request", "body": body, "more_body": more_body}
+
+        async def wrapped_send(message: Message):
+            nonlocal started
+            if failure is not None and not started:
+                return
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, wrapped_receive, wrapped_send)
+        except Exception:
+            # 끊긴 연결로 본문 읽기가 실패한 경우(ClientDisconnect 등)
+            if failure is None or started:
+                raise
+
+        if failure is not None and not started:
+            response = PlainTextResponse(failure.detail, status_code=failure.status_code)
+            await response(scope, receive, send)
+
+    def _compressing_send(self, send: Send, accepted: set[str]) -> Send:
+        if "zstd" in accepted:
+            encoding, encoder_class = "zstd", _ZstdEncoder
+        elif "gzip" in accepted:
+            encoding, encoder_class = "gzip", _GzipEncoder
+        else:
+            return send
+
+        start_message: Message | None = None
+        encoder = None
+        passthrough = False
+
+        async def wrapped(message: Message):
+            nonlocal start_message, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                # 이미 인코딩된 응답은 그대로 보낸다.
+                passthrough = "content-encoding" in Headers(raw=message["headers"])
+                if passthrough:
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                # 첫 청크로 끝나는 작은 응답은 압축하지 않는다.
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                encoder = encoder_class(self.level)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                del headers["Content-Length"]
+                await send(start_message)
+
+            await send({
+                "type": "http.response.body",
+                "body": encoder.compress(body, more_body),
+                "more_body": more_body,
+            })
+
+        return wrapped
@@ -2,6 +2,7 @@ from celery import Celery
 
 from config import get_settings
 from user.application.send_welcome_email_task import SendWelcomeEmailTask
+from study.application.process_session_upload_task import ProcessSessionUploadTask
 
 settings = get_settings()
 
@@ -10,7 +11,11 @@ celery = Celery(
     broker=settings.celery_broker_url,
     backend=settings.celery_backend_url,
     broker_connection_retry_on_startup=True,
-    include=["user.application.send_welcome_email_task"],
+    include=[
+        "user.application.send_welcome_email_task",
+        "study.application.process_session_upload_task",
+    ],
 )
 
-celery.register_task(SendWelcomeEmailTask())
\ No newline at end of file
+celery.register_task(SendWelcomeEmailTask())
+celery.register_task(ProcessSessionUploadTask())
\ No newline at end of file
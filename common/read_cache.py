@@ -0,0 +1,87 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable
+import redis.asyncio as redis
+from common.cache import LRUCache
+from common.logger import logger
+
+# 자주 바뀌지 않는 조회 결과를 위한 2단계 읽기 캐시
+# - 1단계: 워커 프로세스 안의 LRU (local_ttl)
+# - 2단계: 워커들이 공유하는 Redis (ttl)
+# 값을 바꾸는 쪽은 invalidate로 두 단계를 모두 지우고 INVALIDATE_CHANNEL에 키를 발행한다.
+# 각 워커는 채널을 구독해 자기 LRU에서 해당 키를 지운다. 구독이 끊겼던 동안의 메시지는
+# 받을 수 없으므로 재연결 시 LRU를 비우고, local_ttl로 최악의 경우에도 오래된 값을 보는 시간을 제한한다.
+INVALIDATE_CHANNEL = "cache:invalidate"
+
+
+class ReadCache:
+    def __init__(self, redis: redis.Redis, ttl: int = 300, local_ttl: float = 30, maxsize: int = 10000):
+        self.redis = redis
+        self.ttl = ttl
+        self.local = LRUCache(maxsize = maxsize, ttl = local_ttl)
+        self._listener: asyncio.Task | None = None
+
+    # 캐시에는 JSON 문자열을 두고 꺼낼 때마다 새 객체로 만든다. (호출한 쪽이 값을 수정해도 캐시는 그대로)
+    async def get_or_load(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any],
+        decode: Callable[[Any], Any],
+    ) -> Any:
+        self._ensure_listener()
+
+        raw = self.local.get(key)
+        if raw is None:
+            raw = await self.redis.get(key)
+            if raw is not None:
+                raw = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+                self.local.set(key, raw)
+        if raw is not None:
+            return decode(json.loads(raw))
+
+        value = await load()
+        raw = json.dumps(encode(value), default=str)
+        self.local.set(key, raw)
+        await self.redis.set(key, raw, ex=self.ttl)
+        return value
+
+    async def invalidate(self, *keys: str):
+        for key in keys:
+            self.local.delete(key)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            for key in keys:
+                pipe.publish(INVALIDATE_CHANNEL, key)
+            await pipe.execute()
+
+    def _ensure_listener(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        key = message["data"]
+                        self.local.delete(key.decode("utf-8") if isinstance(key, bytes) else key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"read cache invalidation listener disconnected: {e}")
+                await asyncio.sleep(1)
+            finally:
+                self.local.clear()
+                await pubsub.aclose()
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
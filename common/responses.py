@@ -0,0 +1,27 @@
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import JSONResponse
+import orjson
+
+
+def _default(value):
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):   # Float(asdecimal=True) 컬럼을 ORM으로 읽은 값
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    도메인 객체(dataclass, datetime 포함)를 한 번에 직렬화하는 응답 클래스
+    응답 모델(response_model) 검증과 jsonable_encoder 변환을 거치지 않으므로
+    서버가 만든 신뢰할 수 있는 값에만 사용한다. 직렬화는 orjson으로 한다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
@@ -0,0 +1,57 @@
+from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from common.logger import logger
+from database import UnitOfWork
+
+INTERNAL_ERROR_BODY = b'{"detail":"Internal Server Error"}'
+
+
+class UnitOfWorkMiddleware:
+    """
+    HTTP 요청마다 UnitOfWork를 열어 저장소 호출이 DB 세션(커넥션, 트랜잭션) 하나를 함께 쓰게 한다.
+    - 응답을 시작할 때 상태 코드가 400 미만이면 커밋, 그 외에는 롤백한다.
+    - 커밋에 실패하면 앱의 응답 대신 500을 보낸다. (스트리밍 응답은 본문을 보내기 전에 커밋된다)
+    - 웹소켓 등 HTTP가 아닌 요청은 저장소 호출마다 세션을 여는 기존 방식 그대로 둔다.
+    """
+
+    def __init__(self, app: ASGIApp, unit_of_work_factory: Callable[[], UnitOfWork] = UnitOfWork):
+        self.app = app
+        self.unit_of_work_factory = unit_of_work_factory
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        failed = False
+
+        async def send_wrapper(message: Message):
+            nonlocal failed
+            if failed:
+                return
+
+            if message["type"] == "http.response.start":
+                if message["status"] >= 400:
+                    await unit_of_work.rollback()
+                else:
+                    try:
+                        await unit_of_work.commit()
+                    except Exception:
+                        logger.exception("unit of work commit failed")
+                        await unit_of_work.rollback()
+                        failed = True
+                        await send({
+                            "type": "http.response.start",
+                            "status": 500,
+                            "headers": [
+                                (b"content-type", b"application/json"),
+                                (b"content-length", str(len(INTERNAL_ERROR_BODY)).encode()),
+                            ],
+                        })
+                        await send({"type": "http.response.body", "body": INTERNAL_ERROR_BODY})
+                        return
+
+            await send(message)
+
+        async with self.unit_of_work_factory() as unit_of_work:
+            await self.app(scope, receive, send_wrapper)
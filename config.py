@@ -21,6 +21,41 @@ class Settings(BaseSettings):
     redis_port: int = Field(..., env="REDIS_PORT") # 추가
     redis_db: int = Field(0, env="REDIS_DB")   # 추가, 기본값 0
     redis_password: str | None = Field(None, env="REDIS_PASSWORD")
+    ws_batch_size: int = Field(500, env="WS_BATCH_SIZE")            # 웹소켓 수집 시 한 번에 저장할 최대 샘플 수
+    ws_batch_interval: float = Field(2.0, env="WS_BATCH_INTERVAL")  # 웹소켓 수집 시 최대 대기 시간(초)
+    data_insert_chunk_size: int = Field(1000, env="DATA_INSERT_CHUNK_SIZE")  # 집중도 데이터 INSERT 한 번에 묶을 행 수
+    study_data_storage: str = Field("row", env="STUDY_DATA_STORAGE")  # 집중도 데이터 저장 방식 (row: 샘플별 행, chunk: 압축 블록)
+    data_chunk_window: int = Field(256, env="DATA_CHUNK_WINDOW")      # chunk 저장 방식에서 블록 하나에 담을 샘플 수
+    study_write_behind: bool = Field(False, env="STUDY_WRITE_BEHIND")  # 집중도 데이터를 Redis Stream에 먼저 쌓고 나중에 저장
+    flush_interval: float = Field(1.0, env="FLUSH_INTERVAL")           # write-behind flusher가 쉴 때 대기 시간(초)
+    flush_batch_entries: int = Field(100, env="FLUSH_BATCH_ENTRIES")   # flusher가 한 번에 저장할 스트림 엔트리 수
+    session_cache_ttl: int = Field(3600, env="SESSION_CACHE_TTL")             # 세션 소유권 캐시 Redis TTL(초)
+    session_cache_local_ttl: float = Field(30, env="SESSION_CACHE_LOCAL_TTL")   # 세션 소유권 캐시 워커 내 TTL(초)
+    max_upload_samples: int = Field(100_000, env="MAX_UPLOAD_SAMPLES")          # 업로드 한 번에 받을 최대 샘플 수
+    idempotency_ttl: int = Field(86400, env="IDEMPOTENCY_TTL")                  # Idempotency-Key 보관 시간(초)
+    data_unique_time: bool = Field(False, env="DATA_UNIQUE_TIME")               # (session_id, time)이 같은 샘플은 INSERT IGNORE로 건너뜀
+    compression_enabled: bool = Field(True, env="COMPRESSION_ENABLED")          # 요청 압축 해제 / 응답 압축 사용 여부
+    compression_minimum_size: int = Field(1024, env="COMPRESSION_MINIMUM_SIZE") # 이 크기(바이트) 이상인 응답만 압축
+    compression_level: int = Field(6, env="COMPRESSION_LEVEL")                  # gzip(1~9) / zstd(1~22) 압축 레벨
+    max_decompressed_body_size: int = Field(10 * 1024 * 1024, env="MAX_DECOMPRESSED_BODY_SIZE")  # 압축 해제한 요청 본문 최대 크기
+    max_archive_size: int = Field(64 * 1024 * 1024, env="MAX_ARCHIVE_SIZE")      # 오프라인 학습 아카이브 최대 크기(압축 전/후 각각)
+    max_archive_samples: int = Field(2_000_000, env="MAX_ARCHIVE_SAMPLES")      # 오프라인 학습 아카이브 최대 샘플 수
+    upload_job_ttl: int = Field(86400, env="UPLOAD_JOB_TTL")                    # 오프라인 학습 업로드 작업 상태 보관 시간(초)
+    stream_batch_size: int = Field(1000, env="STREAM_BATCH_SIZE")               # 스트리밍 조회 시 서버 측 커서에서 한 번에 가져올 행 수
+    trusted_output: bool = Field(False, env="TRUSTED_OUTPUT")                   # 조회 응답을 응답 모델 검증 없이 도메인 객체에서 바로 직렬화
+    max_batch_sessions: int = Field(50, env="MAX_BATCH_SESSIONS")               # POST /study/data/batch 한 번에 조회할 최대 세션 수
+    session_data_max_age: int = Field(3600, env="SESSION_DATA_MAX_AGE")         # 종료된 세션 데이터 응답의 Cache-Control max-age(초)
+    read_cache_enabled: bool = Field(True, env="READ_CACHE_ENABLED")            # 과목/학습 날짜/유저 조회 캐시 사용 여부
+    read_cache_ttl: int = Field(300, env="READ_CACHE_TTL")                      # 조회 캐시 Redis TTL(초)
+    read_cache_local_ttl: float = Field(30, env="READ_CACHE_LOCAL_TTL")         # 조회 캐시 워커 내 LRU TTL(초)
+    read_cache_maxsize: int = Field(10000, env="READ_CACHE_MAXSIZE")            # 조회 캐시 워커 내 LRU 최대 항목 수
+    unit_of_work_enabled: bool = Field(True, env="UNIT_OF_WORK_ENABLED")        # HTTP 요청 하나의 저장소 호출이 DB 세션 하나를 함께 쓰고 끝에서 한 번 커밋
+    session_count_cache: bool = Field(True, env="SESSION_COUNT_CACHE")          # 유저별 세션 수를 Redis에 캐시 (세션 목록 total_count)
+    session_count_ttl: int = Field(3600, env="SESSION_COUNT_TTL")               # 세션 수 캐시 TTL(초), 지나면 DB에서 다시 세어 보정
+    page_count_window: bool = Field(False, env="PAGE_COUNT_WINDOW")             # page 방식 목록의 전체 개수를 COUNT(*) OVER()로 페이지와 함께 조회
+    float_fetch: bool = Field(True, env="FLOAT_FETCH")                          # 세션/샘플 목록 조회에서 focus/ppg 값을 Decimal 대신 float로 받음
+    query_cache_size: int = Field(500, env="QUERY_CACHE_SIZE")                  # SQLAlchemy 컴파일된 SQL 캐시 크기
+    sql_cache_stats_enabled: bool = Field(False, env="SQL_CACHE_STATS_ENABLED") # GET /health/sql-cache로 컴파일 캐시 통계 공개
 
 # 페이지 교체 알고리즘중 하나인 lru알고리즘으로 이미 구한 값이 있다면 그 값을 반환한다.
 @lru_cache
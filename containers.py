@@ -3,14 +3,24 @@ from dependency_injector import containers, providers
 from user.application.user_service import UserService
 
 from user.infra.repository.user_repo import UserRepository
+from user.infra.repository.cached_user_repo import CachedUserRepository
 
 from study.infra.repository.study_repo import StudyRepository
+from study.infra.repository.chunked_study_repo import ChunkedStudyRepository
+from study.infra.repository.cached_study_repo import CachedStudyRepository
 from study.application.study_service import StudyService
+from study.infra.data_stream import StudyDataStream
+from study.infra.session_cache import SessionOwnershipCache
+from study.infra.session_counter import SessionCounter
+from study.infra.idempotency import IdempotencyStore
+from study.infra.upload_store import SessionUploadStore
 
 from fastapi import BackgroundTasks
 from user.application.email_service import EmailService
 
 import redis.asyncio as redis
+from common.read_cache import ReadCache
+from database import UnitOfWork
 from config import get_settings
 from utils.crypto import Crypto
 
@@ -31,13 +41,67 @@ class Container(containers.DeclarativeContainer):
 
     crypto = providers.Factory(Crypto)
 
+    # 요청마다 새로 만드는 DB 세션/트랜잭션 범위 (middlewares.UnitOfWorkMiddleware에서 사용)
+    # 저장소는 database.get_db_session()으로 현재 요청의 세션을 함께 쓴다.
+    unit_of_work = providers.Factory(UnitOfWork)
+
+    # 과목/학습 날짜/유저 조회 캐시 (워커 내 LRU와 무효화 구독을 공유해야 하므로 Singleton)
+    read_cache = providers.Singleton(
+        ReadCache,
+        redis=redis_client,
+        ttl=settings.read_cache_ttl,
+        local_ttl=settings.read_cache_local_ttl,
+        maxsize=settings.read_cache_maxsize,
+    )
+
     # 의존성을 제공할 모듈을 팩토리에 등록한다.
     user_repo = providers.Factory(UserRepository)
+    if settings.read_cache_enabled:
+        user_repo = providers.Factory(CachedUserRepository, repo=user_repo, cache=read_cache)
     # UserService 생성자로 전달될 user_repo 객체 역시 컨테이너에 있는 팩토리로 선언한다.
     user_service = providers.Factory(UserService, user_repo=user_repo)
 
-    study_repo = providers.Factory(StudyRepository)
-    study_service = providers.Factory(StudyService, study_repo=study_repo)
+    # STUDY_DATA_STORAGE 설정에 따라 집중도 데이터 저장소를 선택한다.
+    study_storage_repo = providers.Selector(
+        providers.Object(settings.study_data_storage),
+        row=providers.Factory(
+            StudyRepository,
+            chunk_size=settings.data_insert_chunk_size,
+            unique_time=settings.data_unique_time,
+            float_fetch=settings.float_fetch,
+        ),
+        chunk=providers.Factory(
+            ChunkedStudyRepository,
+            chunk_size=settings.data_insert_chunk_size,
+            window_size=settings.data_chunk_window,
+            unique_time=settings.data_unique_time,
+            float_fetch=settings.float_fetch,
+        ),
+    )
+    study_repo = study_storage_repo
+    if settings.read_cache_enabled:
+        study_repo = providers.Factory(CachedStudyRepository, repo=study_storage_repo, cache=read_cache)
+    study_data_stream = providers.Singleton(StudyDataStream, redis=redis_client)
+    # 워커 내 LRU를 공유해야 하므로 Singleton으로 등록한다.
+    session_cache = providers.Singleton(
+        SessionOwnershipCache,
+        redis=redis_client,
+        ttl=settings.session_cache_ttl,
+        local_ttl=settings.session_cache_local_ttl,
+    )
+    session_counter = providers.Singleton(SessionCounter, redis=redis_client, ttl=settings.session_count_ttl)
+    idempotency_store = providers.Singleton(IdempotencyStore, redis=redis_client, ttl=settings.idempotency_ttl)
+    session_upload_store = providers.Singleton(SessionUploadStore, redis=redis_client, ttl=settings.upload_job_ttl)
+    study_service = providers.Factory(
+        StudyService,
+        study_repo=study_repo,
+        data_stream=study_data_stream,
+        write_behind=settings.study_write_behind,
+        session_cache=session_cache,
+        upload_store=session_upload_store,
+        session_counter=session_counter if settings.session_count_cache else None,
+        count_window=settings.page_count_window,
+    )
 
     email_service = providers.Factory(EmailService)
     user_service = providers.Factory(
@@ -46,4 +110,5 @@ class Container(containers.DeclarativeContainer):
         email_service=email_service,
         crypto=crypto,
         redis=redis_client,
+        count_window=settings.page_count_window,
     )
\ No newline at end of file
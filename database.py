@@ -1,3 +1,8 @@
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -11,7 +16,34 @@ SQLALCHEMY_DATABASE_URL = (
     f"{settings.database_username}:{settings.database_password}"
     f"@mysql-docker:3306/{settings.database_name}"
 )
-async_engine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=True, future=True)
+async_engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    echo=True,
+    future=True,
+    query_cache_size=settings.query_cache_size,
+)
+
+# SQL 컴파일 캐시 통계: 실행된 문장마다 캐시 적중 여부(cache_hit, cache_miss, no_cache_key 등)를 센다.
+# 적중률이 낮거나 size가 query_cache_size에 닿아 있으면 캐시가 부족하거나 문장이 캐시되지 않는 것이다.
+compiled_cache_counts = Counter()
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_compiled_cache(conn, cursor, statement, parameters, context, executemany):
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit is not None:
+        compiled_cache_counts[cache_hit.name.lower()] += 1
+
+
+def compiled_cache_stats() -> dict:
+    cache = async_engine.sync_engine._compiled_cache
+    hits, misses = compiled_cache_counts["cache_hit"], compiled_cache_counts["cache_miss"]
+    return {
+        **compiled_cache_counts,
+        "hit_ratio": hits / (hits + misses) if hits + misses else None,
+        "size": len(cache) if cache is not None else 0,
+        "capacity": settings.query_cache_size,
+    }
 
 # 데이터베이스 세션이 생성, 옵션으로 autocommit을 False로 해 별도의 커밋 명령이 없으면 커밋이 자동으로 실행되지 않음
 AsyncSessionLocal = sessionmaker(
@@ -27,4 +59,91 @@ async def create_tables():
         await conn.run_sync(Base.metadata.create_all)
 
 async def init_db():
-    await create_tables()
\ No newline at end of file
+    await create_tables()
+
+
+# 요청 단위 작업(Unit of Work)
+# HTTP 요청 하나에서 저장소들이 같은 DB 세션(커넥션, 트랜잭션)을 함께 쓰고 요청이 끝날 때 한 번만 커밋한다.
+# 저장소는 get_db_session()으로 세션을 받고 commit(db)으로 커밋한다.
+# 작업 범위 안에서는 commit(db)이 flush만 하고, 범위 밖(Celery 작업, 스크립트 등)에서는 바로 커밋한다.
+_unit_of_work: ContextVar["UnitOfWork | None"] = ContextVar("unit_of_work", default=None)
+
+
+class UnitOfWork:
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.session: AsyncSession | None = None
+        self._after_commit: list[Callable[[], Awaitable]] = []
+        self._token = None
+
+    # DB를 쓰지 않는 요청은 커넥션을 가져오지 않도록 처음 쓸 때 세션을 만든다.
+    def get_session(self) -> AsyncSession:
+        if self.session is None:
+            self.session = self.session_factory()
+        return self.session
+
+    def add_after_commit(self, callback: Callable[[], Awaitable]):
+        self._after_commit.append(callback)
+
+    async def commit(self):
+        if self.session is not None:
+            await self.session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            await callback()
+
+    async def rollback(self):
+        self._after_commit.clear()
+        if self.session is not None:
+            await self.session.rollback()
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._token = _unit_of_work.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.rollback()
+        finally:
+            if self.session is not None:
+                await self.session.close()
+                self.session = None
+            _unit_of_work.reset(self._token)
+
+
+@asynccontextmanager
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is not None:
+        yield unit_of_work.get_session()
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def commit(db: AsyncSession):
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is not None and unit_of_work.session is db:
+        await db.flush()
+    else:
+        await db.commit()
+
+
+# 커밋된 뒤에 해야 하는 일(캐시 갱신/무효화 등). 작업 범위 밖이면 바로 실행한다.
+async def after_commit(callback: Callable[[], Awaitable]):
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is not None:
+        unit_of_work.add_after_commit(callback)
+    else:
+        await callback()
+
+
+# 응답 전에 결과가 저장됐는지 확인해야 할 때(예: Idempotency-Key 완료 표시) 요청 중간에 커밋한다.
+async def commit_unit_of_work():
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is not None:
+        await unit_of_work.commit()
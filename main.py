@@ -6,9 +6,13 @@ from study.interface.controllers.study_controller import router as study_routers
 from middlewares import create_middlewares
 from fastapi import FastAPI
 from containers import Container
+from config import get_settings
+from database import compiled_cache_stats
 import uvicorn
 
 
+settings = get_settings()
+
 app = FastAPI()
 container = Container()
 # app.container = Container()
@@ -35,6 +39,12 @@ async def validation_exception_handler(
         content=exc.errors(),
     )
 
+# SQL 컴파일 캐시 적중/실패 횟수와 캐시 크기 (운영 중 확인용, 기본은 꺼짐)
+if settings.sql_cache_stats_enabled:
+    @app.get("/health/sql-cache")
+    async def sql_cache_stats():
+        return compiled_cache_stats()
+
 # @app.get("/")
 # def hello():
 #     return {"Hello": "FastAPI"}
@@ -1,18 +1,27 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 
 from common.auth import CurrentUser, decode_access_token
+from common.compression import CompressionMiddleware
+from common.unit_of_work import UnitOfWorkMiddleware
+from config import get_settings
 from context_vars import user_context
 from common.logger import logger
 
-async def create_middlewares(app: FastAPI):
+settings = get_settings()
+
+def create_middlewares(app: FastAPI):
     @app.middleware("http")
     async def get_current_user_middleware(request: Request, call_next):
         authorization = request.headers.get("Authorization")
         if authorization:
             splits = authorization.split(" ")
-            if splits[0] == "Bearer":
+            if splits[0] == "Bearer" and len(splits) > 1:
                 token = splits[1]
-                payload = await decode_access_token(token)
+                # 잘못된 토큰은 여기서 막지 않고 엔드포인트의 인증 의존성(get_current_user)에서 401로 처리한다.
+                try:
+                    payload = await decode_access_token(token)
+                except HTTPException:
+                    payload = {}
                 user_id = payload.get("user_id")
                 user_role = payload.get("role")
 
@@ -20,6 +29,19 @@ async def create_middlewares(app: FastAPI):
 
         logger.info(request.url)
 
-        response = call_next(request)
+        response = await call_next(request)
+
+        return response
+
+    # 요청 단위 DB 세션/트랜잭션 (저장소 호출이 커넥션 하나를 함께 쓰고 응답 전에 한 번 커밋)
+    if settings.unit_of_work_enabled:
+        app.add_middleware(UnitOfWorkMiddleware, unit_of_work_factory=app.container.unit_of_work)
 
-        return response
\ No newline at end of file
+    # 요청 본문 압축 해제(gzip/zstd)와 응답 압축
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            level=settings.compression_level,
+            max_body_size=settings.max_decompressed_body_size,
+        )
@@ -0,0 +1,44 @@
+"""StudyData (session_id, time) index (unique with DATA_UNIQUE_TIME)
+
+Revision ID: 8e4b2c7a1f05
+Revises: 3c1f8a2d9b47
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b2c7a1f05'
+down_revision: Union[str, None] = '3c1f8a2d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기본은 일반 인덱스만 만든다. DATA_UNIQUE_TIME이 켜져 있을 때만 유니크 인덱스로 만들며,
+    # 이미 저장된 중복 샘플은 지우지 않으므로 있으면 정리한 뒤 다시 실행하도록 멈춘다.
+    unique = get_settings().data_unique_time
+    if unique:
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT COUNT(*) FROM ("
+            "SELECT 1 FROM StudyData GROUP BY session_id, time HAVING COUNT(*) > 1"
+            ") duplicated"
+        )).scalar()
+        if duplicates:
+            raise RuntimeError(
+                f"StudyData has {duplicates} duplicated (session_id, time) groups; "
+                "remove them before enabling DATA_UNIQUE_TIME"
+            )
+    op.create_index('ix_studydata_session_time', 'StudyData', ['session_id', 'time'], unique=unique)
+
+
+def downgrade() -> None:
+    # session_id FK가 이 인덱스를 사용하고 있을 수 있으므로 FK용 인덱스를 먼저 만든다.
+    op.create_index(op.f('ix_StudyData_session_id'), 'StudyData', ['session_id'], unique=False)
+    op.drop_index('ix_studydata_session_time', table_name='StudyData')
@@ -0,0 +1,27 @@
+"""StudySession (user_id, created_at) index
+
+Revision ID: 5d2e9f1c7a3b
+Revises: 8e4b2c7a1f05
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e9f1c7a3b'
+down_revision: Union[str, None] = '8e4b2c7a1f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# StudyData (session_id, time)은 8e4b2c7a1f05의 ix_studydata_session_time 인덱스가 이미 담당한다.
+def upgrade() -> None:
+    op.create_index('ix_studysession_user_created', 'StudySession', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_studysession_user_created', table_name='StudySession')
@@ -0,0 +1,37 @@
+"""add StudyDailySummary
+
+Revision ID: a7c3e5f2b914
+Revises: 5d2e9f1c7a3b
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f2b914'
+down_revision: Union[str, None] = '5d2e9f1c7a3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 기존 세션의 요약은 마이그레이션 후 python -m study.application.backfill_daily_summary 로 채운다.
+def upgrade() -> None:
+    op.create_table('StudyDailySummary',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.Column('total_duration', sa.Integer(), nullable=False),
+    sa.Column('focus_sum', sa.Float(), nullable=False),
+    sa.Column('focus_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=6), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['User.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('StudyDailySummary')
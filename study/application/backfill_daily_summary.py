@@ -0,0 +1,18 @@
+import asyncio
+import sys
+from study.domain.repository.study_repo import IStudy
+
+# 날짜별 학습 요약(StudyDailySummary) 백필
+# 요약 테이블을 처음 만든 뒤나 요약이 어긋났을 때 세션 테이블에서 다시 계산한다.
+# 실행: python -m study.application.backfill_daily_summary [user_id]
+async def backfill(study_repo: IStudy, user_id: str | None = None) -> int:
+    return await study_repo.rebuild_daily_summaries(user_id = user_id)
+
+
+if __name__ == "__main__":
+    from containers import Container
+
+    container = Container()
+    user_id = sys.argv[1] if len(sys.argv) > 1 else None
+    count = asyncio.run(backfill(container.study_repo(), user_id))
+    print(f"rebuilt {count} daily summaries" + (f" for user {user_id}" if user_id else ""))
@@ -0,0 +1,64 @@
+import time
+from typing import Awaitable, Callable
+
+
+class DataBatcher:
+    """
+    웹소켓으로 들어오는 샘플을 모아 두었다가 크기(max_size) 또는 시간(max_delay)
+    조건을 만족하면 한 번에 저장한다.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list], Awaitable[list]],
+        max_size: int,
+        max_delay: float,
+    ):
+        self._flush = flush
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._buffer: list = []
+        self._deadline: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def add(self, datas: list):
+        if not datas:
+            return
+        # 첫 샘플이 들어온 시점부터 max_delay 안에 저장되도록 마감 시간을 정한다.
+        if self._deadline is None:
+            self._deadline = time.monotonic() + self.max_delay
+        self._buffer.extend(datas)
+
+    def is_full(self) -> bool:
+        return len(self._buffer) >= self.max_size
+
+    # 다음 메시지를 기다릴 수 있는 최대 시간 (버퍼가 비어 있으면 None = 무제한)
+    def timeout(self) -> float | None:
+        if self._deadline is None:
+            return None
+        return max(self._deadline - time.monotonic(), 0)
+
+    # 저장에 실패하면 샘플을 버퍼 앞에 되돌리고 max_delay 뒤에 다시 저장하도록 한 뒤 예외를 그대로 올린다.
+    async def flush(self) -> int:
+        if not self._buffer:
+            return 0
+
+        datas, self._buffer = self._buffer, []
+        self._deadline = None
+        try:
+            await self._flush(datas)
+        except Exception:
+            self._buffer = datas + self._buffer
+            self._deadline = time.monotonic() + self.max_delay
+            raise
+
+        return len(datas)
+
+    # 다시 저장해도 같은 결과인 샘플(세션 없음 등)을 버린다.
+    def clear(self) -> int:
+        count = len(self._buffer)
+        self._buffer = []
+        self._deadline = None
+        return count
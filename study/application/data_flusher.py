@@ -0,0 +1,72 @@
+import asyncio
+from common.logger import logger
+from study.domain.repository.study_repo import IStudy
+from study.infra.data_stream import StudyDataStream
+
+# 쓰기 지연(write-behind) 모드에서 Redis Stream에 쌓인 집중도 데이터를 MySQL로 옮기는 작업자
+# MySQL 커밋이 끝난 엔트리만 스트림에서 지우므로 최소 한 번(at-least-once) 저장된다.
+# 재처리로 인한 중복은 save_data(ignore_duplicates=True)로 걸러낸다.
+# 실행: python -m study.application.data_flusher (한 프로세스만 실행한다)
+class StudyDataFlusher:
+    def __init__(
+        self,
+        study_repo: IStudy,
+        data_stream: StudyDataStream,
+        batch_entries: int = 100,
+        max_sessions: int = 100,
+    ):
+        self.study_repo = study_repo
+        self.data_stream = data_stream
+        self.batch_entries = batch_entries
+        self.max_sessions = max_sessions
+
+    # 대기 중인 세션들을 한 번씩 비운다. 저장한 샘플 수를 반환
+    async def flush_once(self) -> int:
+        total = 0
+        for session_id in await self.data_stream.claim(self.max_sessions):
+            try:
+                total += await self._flush_session(session_id)
+            except Exception:
+                logger.exception(f"study data flush failed: {session_id}")
+                await self.data_stream.requeue(session_id)
+                continue
+
+            await self.data_stream.release(session_id)
+
+        return total
+
+    async def _flush_session(self, session_id: str) -> int:
+        total = 0
+        while True:
+            entries = await self.data_stream.read(session_id, self.batch_entries)
+            if not entries:
+                return total
+
+            # 엔트리 여러 개(업로드 여러 번)를 한 번의 bulk insert로 저장
+            datas = [data for _, _, entry_datas in entries for data in entry_datas]
+            await self.study_repo.save_data(user_id = entries[0][1], datas = datas, ignore_duplicates = True)
+            await self.data_stream.ack(session_id, [entry_id for entry_id, _, _ in entries])
+            total += len(datas)
+
+    async def run(self, interval: float):
+        await self.data_stream.recover()
+        while True:
+            saved = await self.flush_once()
+            if saved:
+                logger.info(f"flushed {saved} study datas")
+            else:
+                await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    from config import get_settings
+    from containers import Container
+
+    settings = get_settings()
+    container = Container()
+    flusher = StudyDataFlusher(
+        study_repo = container.study_repo(),
+        data_stream = container.study_data_stream(),
+        batch_entries = settings.flush_batch_entries,
+    )
+    asyncio.run(flusher.run(settings.flush_interval))
@@ -0,0 +1,29 @@
+import numpy as np
+
+
+# min/max 구간 축소(decimation)
+# 샘플을 max_points // 2 개의 구간으로 나누고 구간마다 최솟값과 최댓값 샘플만 남긴다.
+# 봉우리와 골짜기가 유지되므로 그래프 모양이 보존된다. 남길 샘플의 인덱스를 시간순으로 반환한다.
+def minmax_indices(values: list, max_points: int) -> list[int]:
+    count = len(values)
+    if count <= max_points:
+        return list(range(count))
+
+    buckets = max(max_points // 2, 1)
+    return _minmax_numpy(values, buckets)
+
+
+def _minmax_numpy(values: list, buckets: int) -> list[int]:
+    count = len(values)
+    series = np.fromiter((float(value) for value in values), dtype=np.float64, count=count)
+    bucket_ids = np.arange(count) * buckets // count
+
+    # (구간, 값) 순으로 정렬하면 각 구간의 첫 원소가 최솟값이다. lexsort는 안정 정렬이므로 같은 값이면 앞선 샘플이 먼저 온다.
+    # 최댓값도 같은 값 중 앞선 샘플을 고르도록 (구간, -값) 순으로 한 번 더 정렬해 첫 원소를 쓴다.
+    order = np.lexsort((series, bucket_ids))
+    order_desc = np.lexsort((-series, bucket_ids))
+    sorted_ids = bucket_ids[order]
+    first = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+
+    return np.union1d(order[first], order_desc[first]).tolist()
+
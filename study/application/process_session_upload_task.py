@@ -0,0 +1,60 @@
+import asyncio
+from celery import Task
+from fastapi import HTTPException
+
+from config import get_settings
+from study.infra.upload_store import DONE, FAILED, PROCESSING
+from study.interface.data_formats import parse_session_archive
+
+settings = get_settings()
+
+
+# 오프라인 학습 아카이브(POST /study/session/upload)를 읽어 세션과 전체 샘플을 한 트랜잭션으로 저장한다.
+class ProcessSessionUploadTask(Task):
+    name = "process_session_upload_task"
+
+    def run(self, job_id: str):
+        asyncio.run(self._process(job_id))
+
+    async def _process(self, job_id: str):
+        # 작업마다 새 이벤트 루프에서 실행되므로 Redis/DB 연결도 작업마다 만들고 정리한다.
+        from containers import Container
+        from database import async_engine
+
+        container = Container()
+        upload_store = container.session_upload_store()
+        try:
+            loaded = await upload_store.load(job_id)
+            if loaded is None:   # 만료됐거나 이미 처리된 작업
+                return
+            user_id, archive = loaded
+            await upload_store.set_state(job_id, PROCESSING)
+
+            try:
+                parsed = parse_session_archive(archive, settings.max_archive_samples, settings.max_archive_size)
+                session = await container.study_service().import_session(
+                    user_id = user_id,
+                    subject = parsed.subject,
+                    start_time = parsed.start_time,
+                    end_time = parsed.end_time,
+                    avg_focus = parsed.avg_focus,
+                    ai_avg_focus = parsed.ai_avg_focus,
+                    times = parsed.times,
+                    ppg_values = parsed.ppg_values,
+                    focus_scores = parsed.focus_scores,
+                )
+            except ValueError as e:
+                await upload_store.set_state(job_id, FAILED, error = str(e))
+                return
+            except HTTPException as e:
+                await upload_store.set_state(job_id, FAILED, error = e.detail or f"HTTP {e.status_code}")
+                return
+            except Exception:
+                await upload_store.set_state(job_id, FAILED, error = "internal error")
+                raise
+
+            await upload_store.set_state(job_id, DONE, session_id = session.id, count = len(parsed.times))
+        finally:
+            await container.read_cache().close()
+            await container.redis_client().aclose()
+            await async_engine.dispose()
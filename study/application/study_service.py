@@ -1,8 +1,20 @@
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 from ulid import ULID
-from study.domain.study import StudySession, StudyData, Subject
+from common.messaging import celery
+from database import after_commit
+from study.application.process_session_upload_task import ProcessSessionUploadTask
+from study.application.downsampling import minmax_indices
+from study.domain.study import StudyDailySummary, StudySession, StudyData, StudyDataColumns, Subject
 from study.domain.repository.study_repo import IStudy
-from datetime import datetime
-from typing import Optional
+from study.infra.data_stream import StudyDataStream
+from study.infra.session_cache import SESSION_CLOSED, SESSION_OPEN, SessionOwnershipCache
+from study.infra.session_counter import SessionCounter
+from study.infra.upload_store import SessionUploadStore
+from utils.cursor import decode_cursor, encode_cursor
+from utils.ulid_allocator import ulid_allocator
+from datetime import date, datetime
+from typing import AsyncIterator, Optional
 from dependency_injector.wiring import inject
 import pytz
 
@@ -10,28 +22,98 @@ import pytz
 korea_timezone = pytz.timezone('Asia/Seoul')
 
 class StudyService:
+    # write_behind가 켜져 있으면 집중도 데이터를 Redis Stream(data_stream)에 먼저 쌓고
+    # 별도의 flusher(study.application.data_flusher)가 모아서 MySQL에 저장한다.
+    # session_cache가 있으면 데이터 업로드 시 세션 소유권 확인을 캐시로 처리한다.
     @inject
-    def __init__(self, study_repo: IStudy):
+    def __init__(
+        self,
+        study_repo: IStudy,
+        data_stream: StudyDataStream | None = None,
+        write_behind: bool = False,
+        session_cache: SessionOwnershipCache | None = None,
+        upload_store: SessionUploadStore | None = None,
+        session_counter: SessionCounter | None = None,
+        count_window: bool = False,
+    ):
         self.study_repo = study_repo
+        self.data_stream = data_stream
+        self.write_behind = write_behind and data_stream is not None
+        self.session_cache = session_cache
+        self.upload_store = upload_store
+        self.session_counter = session_counter
+        self.count_window = count_window
         self.ulid = ULID()
 
     # 사용자의 학습 세션들을 가져온다(페이지네이션 처리됨)
+    # cursor가 있으면 커서(keyset) 방식, 없으면 기존 page/offset 방식으로 조회한다.
+    # 두 방식 모두 다음 페이지가 있으면 next_cursor를 함께 반환한다.
+    # include_total이 None이면 page 방식은 전체 개수를 세고, 커서 방식은 세지 않는다. (세지 않으면 None)
     async def get_sessions(
         self, 
         user_id: str, 
-        page: int, 
-        items_per_page: int
-    ) -> tuple[int, list[StudySession]]:
-        return await self.study_repo.get_sessions(
-            user_id = user_id, 
-            page = page, 
-            items_per_page = items_per_page,
+        page: int = 1, 
+        items_per_page: int = 10,
+        cursor: str | None = None,
+        include_total: bool | None = None,
+    ) -> tuple[int | None, list[StudySession], str | None]:
+        if include_total is None:
+            include_total = cursor is None
+
+        if cursor is None:
+            offset = (page - 1) * items_per_page
+            if not include_total:
+                # 한 개 더 읽어서 다음 페이지가 있는지 확인한다.
+                sessions = await self.study_repo.get_sessions_page(user_id = user_id, offset = offset, limit = items_per_page + 1)
+                total_count, has_more, sessions = None, len(sessions) > items_per_page, sessions[:items_per_page]
+            elif self.session_counter:
+                total_count = await self.count_sessions(user_id = user_id)
+                sessions = await self.study_repo.get_sessions_page(user_id = user_id, offset = offset, limit = items_per_page)
+                has_more = page * items_per_page < total_count
+            else:
+                total_count, sessions = await self.study_repo.get_sessions(
+                    user_id = user_id, 
+                    page = page, 
+                    items_per_page = items_per_page,
+                    window = self.count_window,
+                )
+                has_more = page * items_per_page < total_count
+            next_cursor = encode_cursor(sessions[-1].id) if sessions and has_more else None
+            return total_count, sessions, next_cursor
+
+        # 한 개 더 읽어서 다음 페이지가 있는지 확인한다.
+        sessions = await self.study_repo.get_sessions_after(
+            user_id = user_id,
+            after_id = decode_cursor(cursor) if cursor else None,
+            limit = items_per_page + 1,
         )
+        next_cursor = encode_cursor(sessions[items_per_page - 1].id) if len(sessions) > items_per_page else None
+        total_count = await self.count_sessions(user_id = user_id) if include_total else None
+        return total_count, sessions[:items_per_page], next_cursor
+
+    # 유저의 전체 세션 수 (session_counter가 있으면 Redis에 캐시된 값)
+    async def count_sessions(self, user_id: str) -> int:
+        if self.session_counter:
+            return await self.session_counter.get(user_id, lambda: self.study_repo.count_sessions(user_id = user_id))
+        return await self.study_repo.count_sessions(user_id = user_id)
     
     # 사용자의 학습 세션들의 날짜만 가져온다
     async def get_session_dates(self, user_id: str) -> tuple[int, list[str]]:
         return await self.study_repo.get_session_dates(user_id = user_id)
     
+    # 날짜별 학습 요약 (세션 수, 학습 시간, 평균 집중도)
+    async def get_daily_summaries(
+        self,
+        user_id: str,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[StudyDailySummary]:
+        return await self.study_repo.get_daily_summaries(
+            user_id = user_id,
+            start_date = start_date,
+            end_date = end_date,
+        )
+
     # 해당 날짜의 세션을 가져온다    
     async def get_sessions_by_date(
         self,
@@ -43,9 +125,98 @@ class StudyService:
             date = date
         )
     
+    # 종료된 세션의 데이터 버전 (세션 id + updated_at + 샘플 수, 진행 중이거나 없는 세션이면 None)
+    # 샘플을 읽지 않고 조건부 요청(ETag)의 304 여부를 판단하는 데 사용한다.
+    async def get_data_version(self, user_id: str, session_id: str) -> str | None:
+        version = await self.study_repo.find_session_version(user_id = user_id, session_id = session_id)
+        if version is None:
+            return None
+
+        end_time, updated_at, count = version
+        if end_time is None:
+            return None
+        updated_at = updated_at.isoformat() if isinstance(updated_at, datetime) else str(updated_at)
+        return f"{session_id}:{updated_at}:{count}"
+
     # 사용자의 특정 세션의 세부데이터를 가져온다.
-    async def get_datas(self, user_id: str, session_id: str) -> list[StudyData]:
-        return await self.study_repo.find_datas_by_session_id(user_id = user_id, session_id = session_id)    
+    # bucket: 초 단위 구간별 평균으로 집계 (DB에서 GROUP BY)
+    # max_points: 구간별 최솟값/최댓값만 남겨 최대 max_points 개로 줄인다.
+    async def get_datas(
+        self,
+        user_id: str,
+        session_id: str,
+        max_points: int | None = None,
+        bucket: int | None = None,
+    ) -> list[StudyData]:
+        if bucket is not None:
+            datas = await self.study_repo.find_data_buckets(
+                user_id = user_id,
+                session_id = session_id,
+                bucket_seconds = bucket,
+            )
+        else:
+            datas = await self._find_datas(user_id = user_id, session_id = session_id)
+
+        if max_points is not None:
+            indices = minmax_indices([data.focus_score for data in datas], max_points)
+            datas = [datas[index] for index in indices]
+
+        return datas
+
+    # 여러 세션의 데이터를 한 번의 쿼리로 가져온다. (요청한 순서대로, 없거나 다른 유저의 세션은 빈 리스트)
+    async def get_datas_batch(
+        self,
+        user_id: str,
+        session_ids: list[str],
+        max_points: int | None = None,
+    ) -> dict[str, list[StudyData]]:
+        session_ids = list(dict.fromkeys(session_ids))
+        found = await self.study_repo.find_datas_by_session_ids(user_id = user_id, session_ids = session_ids)
+
+        result = {}
+        for session_id in session_ids:
+            datas = await self._merge_pending(user_id, session_id, found.get(session_id, []))
+            if max_points is not None:
+                datas = [datas[index] for index in minmax_indices([data.focus_score for data in datas], max_points)]
+            result[session_id] = datas
+
+        return result
+
+    # 세션 데이터를 한 번에 모으지 않고 하나씩 반환한다.
+    # write-behind 모드면 아직 저장되지 않은 샘플(세션당 최대 flush 주기만큼)을 먼저 읽어두고
+    # DB 샘플 중 같은 샘플(저장소의 sample_key 기준)은 건너뛴 뒤 마지막에 붙인다.
+    async def stream_datas(self, user_id: str, session_id: str, batch_size: int = 1000) -> AsyncIterator[StudyData]:
+        pending = []
+        if self.write_behind:
+            pending = await self.data_stream.tail(user_id = user_id, session_id = session_id)
+        sample_key = self.study_repo.sample_key
+        pending_keys = {sample_key(data) for data in pending}
+
+        async for data in self.study_repo.stream_datas_by_session_id(
+            user_id = user_id,
+            session_id = session_id,
+            batch_size = batch_size,
+        ):
+            if sample_key(data) not in pending_keys:
+                yield data
+
+        for data in pending:
+            yield data
+
+    async def _find_datas(self, user_id: str, session_id: str) -> list[StudyData]:
+        datas = await self.study_repo.find_datas_by_session_id(user_id = user_id, session_id = session_id)
+        return await self._merge_pending(user_id, session_id, datas)
+
+    async def _merge_pending(self, user_id: str, session_id: str, datas: list[StudyData]) -> list[StudyData]:
+        if not self.write_behind:
+            return datas
+
+        # 아직 MySQL에 저장되지 않은 샘플을 뒤에 붙인다.
+        # 저장 직후 스트림에서 지워지기 전인 엔트리는 저장소의 sample_key(행: id, 블록: 측정 시간)로 중복 제거
+        sample_key = self.study_repo.sample_key
+        saved_keys = {sample_key(data) for data in datas}
+        pending = await self.data_stream.tail(user_id = user_id, session_id = session_id)
+        return datas + [data for data in pending if sample_key(data) not in saved_keys]
         
     
     # 학습 세션 생성
@@ -72,9 +243,76 @@ class StudyService:
         )
 
         await self.study_repo.save_session(user_id = user_id, session = session)
+
+        if self.session_cache:
+            await after_commit(lambda: self.session_cache.set(user_id, session.id, SESSION_OPEN))
+        if self.session_counter:
+            await after_commit(lambda: self.session_counter.incr(user_id, 1))
         
         return session
     
+    # 오프라인 학습 아카이브를 보관하고 Celery 작업으로 처리를 요청한다. (작업 id 반환)
+    async def enqueue_session_upload(self, user_id: str, archive: bytes) -> str:
+        job_id = self.ulid.generate()
+        await self.upload_store.save(job_id, user_id, archive)
+        await run_in_threadpool(celery.send_task, ProcessSessionUploadTask.name, args=[job_id])
+
+        return job_id
+
+    # 오프라인 학습 업로드 작업 상태 조회
+    async def get_upload_status(self, user_id: str, job_id: str) -> dict:
+        status = await self.upload_store.get_status(user_id, job_id)
+        if status is None:
+            raise HTTPException(status_code = 404, detail = "Upload job not found")
+
+        return status
+
+    # 종료된 세션과 전체 샘플을 한 번에 저장 (오프라인 학습 업로드 처리)
+    async def import_session(
+        self,
+        user_id: str,
+        subject: str,
+        start_time: str,
+        end_time: str,
+        avg_focus: Optional[float],
+        ai_avg_focus: Optional[float],
+        times: list[datetime],
+        ppg_values: list[float],
+        focus_scores: list[float],
+    ) -> StudySession:
+        now_korea = datetime.now(korea_timezone)
+        subject = await self.study_repo.find_by_subject_name(user_id = user_id, subject_name = subject)
+
+        session = StudySession(
+            id = self.ulid.generate(),
+            user_id = user_id,
+            subject_id = subject.id,
+            subject = subject.subject_name,
+            avg_focus = avg_focus,
+            ai_avg_focus = ai_avg_focus,
+            start_time = start_time,
+            end_time = end_time,
+            created_at = now_korea,
+            updated_at = now_korea,
+        )
+        columns = StudyDataColumns(
+            session_id = session.id,
+            ids = ulid_allocator.allocate(len(times)),
+            ppg_values = ppg_values,
+            focus_scores = focus_scores,
+            times = times,
+            created_at = now_korea,
+        )
+
+        await self.study_repo.save_session_archive(user_id = user_id, session = session, columns = columns)
+
+        if self.session_cache:
+            await after_commit(lambda: self.session_cache.set(user_id, session.id, SESSION_CLOSED))
+        if self.session_counter:
+            await after_commit(lambda: self.session_counter.incr(user_id, 1))
+
+        return session
+
     # 학습 세션 종료
     async def complete_session(
         self,
@@ -94,6 +332,9 @@ class StudyService:
 
         await self.study_repo.update_session(user_id = user_id, session = session)
 
+        if self.session_cache:
+            await after_commit(lambda: self.session_cache.set(user_id, session.id, SESSION_CLOSED))
+
         return session
 
     # ppg 데이터 생성
@@ -102,28 +343,96 @@ class StudyService:
         user_id: str,
         session_id: str,
         datas: list[dict]
-    ) -> list[StudyData]:
+    ) -> list[StudyData] | list[dict]:
 
-        await self.study_repo.find_session_by_id(user_id = user_id, session_id = session_id)
-        now_korea = datetime.now(korea_timezone)
+        await self.check_session(user_id = user_id, session_id = session_id)
 
-        study_datas = []
-        for data in datas:
-            study_data = StudyData(
-                id = self.ulid.generate(),
-                session_id = session_id,
-                ppg_value = data.ppg_value,
-                focus_score = data.focus_score,
-                time = data.time,
-                created_at = now_korea
-            )
-            study_datas.append(study_data)
+        return await self.append_datas(user_id = user_id, session_id = session_id, datas = datas)
+
+    # 세션 소유권 확인 (캐시에 있으면 DB 조회 생략, 없으면 조회 후 캐시에 채운다)
+    async def check_session(self, user_id: str, session_id: str):
+        if self.session_cache and await self.session_cache.get(user_id, session_id):
+            return
 
-        return await self.study_repo.save_data(user_id = user_id, datas = study_datas)
+        session = await self.study_repo.find_session_by_id(user_id = user_id, session_id = session_id)
+
+        if self.session_cache:
+            state = SESSION_CLOSED if session.end_time else SESSION_OPEN
+            await self.session_cache.set(user_id, session_id, state)
+
+    # 열 단위(times/ppg/focus 배열)로 올라온 ppg 데이터 생성
+    async def create_data_columns(
+        self,
+        user_id: str,
+        session_id: str,
+        times: list[datetime],
+        ppg_values: list[float],
+        focus_scores: list[float],
+    ) -> list[StudyData] | list[dict]:
+
+        await self.check_session(user_id = user_id, session_id = session_id)
+
+        return await self.append_columns(
+            user_id = user_id,
+            session_id = session_id,
+            times = times,
+            ppg_values = ppg_values,
+            focus_scores = focus_scores,
+        )
+
+    # 이미 검증된 세션에 ppg 데이터 저장 (세션 조회 생략)
+    async def append_datas(
+        self,
+        user_id: str,
+        session_id: str,
+        datas: list[dict]
+    ) -> list[StudyData] | list[dict]:
+        return await self.append_columns(
+            user_id = user_id,
+            session_id = session_id,
+            times = [data.time for data in datas],
+            ppg_values = [data.ppg_value for data in datas],
+            focus_scores = [data.focus_score for data in datas],
+        )
+
+    # id는 한 번에 발급하고 샘플을 열 단위로 모아 저장소에 넘긴다.
+    async def append_columns(
+        self,
+        user_id: str,
+        session_id: str,
+        times: list[datetime],
+        ppg_values: list[float],
+        focus_scores: list[float],
+    ) -> list[StudyData] | list[dict]:
+        columns = StudyDataColumns(
+            session_id = session_id,
+            ids = ulid_allocator.allocate(len(times)),
+            ppg_values = ppg_values,
+            focus_scores = focus_scores,
+            times = times,
+            created_at = datetime.now(korea_timezone),
+        )
+
+        if self.write_behind:
+            study_datas = columns.to_datas()
+            await self.data_stream.append(user_id = user_id, session_id = session_id, datas = study_datas)
+            return study_datas
+
+        return await self.study_repo.save_data_columns(user_id = user_id, columns = columns)
 
     # 특정 세션 삭제
     async def delete_session(self, user_id: str, session_id: str):
-        return await self.study_repo.delete_session(user_id = user_id, session_id = session_id)
+        await self.study_repo.delete_session(user_id = user_id, session_id = session_id)
+
+        if self.session_counter:
+            await after_commit(lambda: self.session_counter.incr(user_id, -1))
+
+        # 캐시/대기 중인 샘플은 삭제가 커밋된 뒤에 지운다. (롤백되면 그대로 둔다)
+        if self.session_cache:
+            await after_commit(lambda: self.session_cache.delete(user_id, session_id))
+
+        if self.write_behind:
+            await after_commit(lambda: self.data_stream.discard(session_id))
 
     # 전체 과목 조회
     async def get_subjects(self, user_id: str):
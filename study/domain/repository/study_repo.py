@@ -1,15 +1,46 @@
 from abc import ABCMeta, abstractmethod
-from study.domain.study import StudySession, StudyData, Subject
+from datetime import date, datetime
+from typing import AsyncIterator
+from study.domain.study import StudyDailySummary, StudySession, StudyData, StudyDataColumns, Subject
 
 class IStudy(metaclass=ABCMeta):
+    # window이면 전체 개수와 페이지를 쿼리 한 번(윈도 함수)으로 조회
     @abstractmethod
-    async def get_sessions(self, user_id: str, page: int, items_per_page:int) -> tuple[int, list[StudySession]]:
+    async def get_sessions(self, user_id: str, page: int, items_per_page:int, window: bool = False) -> tuple[int, list[StudySession]]:
+        raise NotImplementedError
+
+    # 전체 개수 없이 id 순으로 offset부터 최대 limit 개 조회
+    @abstractmethod
+    async def get_sessions_page(self, user_id: str, offset: int, limit: int) -> list[StudySession]:
+        raise NotImplementedError
+
+    # after_id 다음 세션부터 id 순으로 최대 limit 개 조회 (after_id가 None이면 처음부터)
+    @abstractmethod
+    async def get_sessions_after(self, user_id: str, after_id: str | None, limit: int) -> list[StudySession]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_sessions(self, user_id: str) -> int:
         raise NotImplementedError
     
     @abstractmethod
     async def get_session_dates(self, user_id: str) -> tuple[int, list[str]]:
         raise NotImplementedError
     
+    @abstractmethod
+    async def get_daily_summaries(
+        self,
+        user_id: str,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[StudyDailySummary]:
+        raise NotImplementedError
+
+    # 날짜별 요약을 세션 테이블에서 다시 계산 (user_id가 None이면 전체)
+    @abstractmethod
+    async def rebuild_daily_summaries(self, user_id: str | None = None) -> int:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_sessions_by_date(self, user_id: str, date: str) -> tuple[int, list[StudySession]]:
         raise NotImplementedError
@@ -18,6 +49,26 @@ class IStudy(metaclass=ABCMeta):
     async def find_datas_by_session_id(self, user_id: str, session_id: str) -> list[StudyData]:
         raise NotImplementedError
 
+    # 여러 세션의 데이터를 한 번에 조회 (세션 id -> 시간순 데이터, 다른 유저의 세션은 빠진다)
+    @abstractmethod
+    async def find_datas_by_session_ids(self, user_id: str, session_ids: list[str]) -> dict[str, list[StudyData]]:
+        raise NotImplementedError
+
+    # 서버 측 커서로 batch_size 행씩 읽으면서 시간순으로 하나씩 반환
+    @abstractmethod
+    def stream_datas_by_session_id(self, user_id: str, session_id: str, batch_size: int) -> AsyncIterator[StudyData]:
+        raise NotImplementedError
+
+    # bucket_seconds 초 단위 구간별 평균 데이터 조회
+    @abstractmethod
+    async def find_data_buckets(self, user_id: str, session_id: str, bucket_seconds: int) -> list[StudyData]:
+        raise NotImplementedError
+
+    # 세션의 (end_time, updated_at, 샘플 수)를 샘플을 읽지 않고 조회 (세션이 없으면 None, 진행 중인 세션의 샘플 수는 None)
+    @abstractmethod
+    async def find_session_version(self, user_id: str, session_id: str) -> tuple[str | None, datetime, int | None] | None:
+        raise NotImplementedError
+
     @abstractmethod
     async def find_session_by_id(self, user_id: str, session_id: str) -> StudySession:
         raise NotImplementedError
@@ -30,8 +81,24 @@ class IStudy(metaclass=ABCMeta):
     async def update_session(self, user_id:str, session: StudySession) -> StudySession:
         raise NotImplementedError
     
+    # 저장된 샘플과 아직 저장되지 않은(write-behind) 샘플이 같은 샘플인지 비교할 키
+    @abstractmethod
+    def sample_key(self, data: StudyData):
+        raise NotImplementedError
+
+    # ignore_duplicates: 이미 저장된 샘플은 건너뛴다 (재전송/재처리 시 사용)
+    @abstractmethod
+    async def save_data(self, user_id:str, datas: list[StudyData], ignore_duplicates: bool = False) -> list[StudyData]:
+        raise NotImplementedError
+
+    # 열 단위 샘플 저장 (저장한 행을 dict 리스트로 반환)
+    @abstractmethod
+    async def save_data_columns(self, user_id:str, columns: StudyDataColumns, ignore_duplicates: bool = False) -> list[dict]:
+        raise NotImplementedError
+
+    # 세션과 전체 샘플을 한 트랜잭션으로 저장 (오프라인 학습 업로드)
     @abstractmethod
-    async def save_data(self, user_id:str, datas: list[StudyData]) -> list[StudyData]:
+    async def save_session_archive(self, user_id:str, session: StudySession, columns: StudyDataColumns) -> StudySession:
         raise NotImplementedError
 
     # 학습 세션 삭제
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class StudySession:
     id: str
     user_id: str
@@ -14,7 +14,7 @@ class StudySession:
     created_at: datetime
     updated_at: datetime
 
-@dataclass
+@dataclass(slots=True)
 class StudyData:
     id: str
     session_id: str
@@ -23,7 +23,46 @@ class StudyData:
     time: datetime
     created_at: datetime
 
-@dataclass
+# 한 번의 업로드에 담긴 샘플을 열(column) 단위로 담는다.
+# 샘플마다 StudyData를 만들지 않고 INSERT 파라미터/응답용 dict를 바로 만든다.
+@dataclass(slots=True)
+class StudyDataColumns:
+    session_id: str
+    ids: list[str]
+    ppg_values: list[float]
+    focus_scores: list[float]
+    times: list[datetime]
+    created_at: datetime
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def rows(self) -> list[dict]:
+        session_id, created_at = self.session_id, self.created_at
+        return [
+            {
+                "id": id,
+                "session_id": session_id,
+                "ppg_value": ppg_value,
+                "focus_score": focus_score,
+                "time": time,
+                "created_at": created_at,
+            }
+            for id, ppg_value, focus_score, time in zip(self.ids, self.ppg_values, self.focus_scores, self.times)
+        ]
+
+    def to_datas(self) -> list[StudyData]:
+        return [StudyData(**row) for row in self.rows()]
+
+# 날짜별 학습 요약 (total_duration: 초, avg_focus: 그날 세션 avg_focus의 평균)
+@dataclass(slots=True)
+class StudyDailySummary:
+    date: str
+    session_count: int
+    total_duration: int
+    avg_focus: float | None
+
+@dataclass(slots=True)
 class Subject:
     id: str
     user_id: str
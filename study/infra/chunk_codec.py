@@ -0,0 +1,74 @@
+# StudyDataChunk 블록 인코딩/디코딩
+# 블록 하나 = 같은 세션의 연속된 샘플 묶음
+# payload = zlib( uint32 시간 delta(μs)[count] + float32 ppg[count] + float32 focus[count] ), little-endian
+# 첫 샘플의 시간은 start_time 컬럼에 저장하고 delta는 바로 앞 샘플과의 차이다.
+import struct
+import zlib
+from datetime import datetime, timedelta
+
+# delta 하나가 표현할 수 있는 최대 간격 (약 71분). 이보다 벌어지면 새 블록을 시작한다.
+MAX_DELTA = 2**32 - 1
+
+Sample = tuple[datetime, float, float]   # (time, ppg_value, focus_score)
+
+
+def _naive(time: datetime) -> datetime:
+    # DB에는 시간대 없이 저장되므로 기존 StudyData와 같은 방식(시간대 정보 제거)으로 맞춘다.
+    return time.replace(tzinfo=None) if time.tzinfo else time
+
+
+def _micros(delta: timedelta) -> int:
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def normalize(samples: list[Sample]) -> list[Sample]:
+    return sorted(((_naive(time), ppg, focus) for time, ppg, focus in samples), key=lambda sample: sample[0])
+
+
+def split_windows(samples: list[Sample], size: int) -> list[list[Sample]]:
+    windows: list[list[Sample]] = []
+    current: list[Sample] = []
+    for sample in samples:
+        if current and (len(current) >= size or _micros(sample[0] - current[-1][0]) > MAX_DELTA):
+            windows.append(current)
+            current = []
+        current.append(sample)
+    if current:
+        windows.append(current)
+
+    return windows
+
+
+def can_append(window: list[Sample], sample: Sample) -> bool:
+    return 0 <= _micros(sample[0] - window[-1][0]) <= MAX_DELTA
+
+
+def encode_chunk(window: list[Sample]) -> tuple[datetime, int, bytes]:
+    count = len(window)
+    start_time = window[0][0]
+
+    deltas = [0]
+    for previous, current in zip(window, window[1:]):
+        deltas.append(_micros(current[0] - previous[0]))
+
+    raw = struct.pack(
+        f"<{count}I{count}f{count}f",
+        *deltas,
+        *(float(sample[1]) for sample in window),
+        *(float(sample[2]) for sample in window),
+    )
+
+    return start_time, count, zlib.compress(raw, 1)
+
+
+def decode_chunk(start_time: datetime, count: int, payload: bytes) -> list[Sample]:
+    values = struct.unpack(f"<{count}I{count}f{count}f", zlib.decompress(payload))
+    deltas, ppgs, focuses = values[:count], values[count:2 * count], values[2 * count:]
+
+    samples = []
+    time = start_time
+    for delta, ppg, focus in zip(deltas, ppgs, focuses):
+        time = time + timedelta(microseconds=delta)
+        samples.append((time, ppg, focus))
+
+    return samples
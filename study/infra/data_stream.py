@@ -0,0 +1,122 @@
+import json
+from datetime import datetime
+import redis.asyncio as redis
+from study.domain.study import StudyData
+
+# 쓰기 지연(write-behind) 모드에서 아직 MySQL에 저장되지 않은 집중도 데이터를 보관하는 Redis Stream
+# - study:data:{session_id} : 세션별 스트림, 엔트리 하나 = 업로드 한 번(샘플 묶음)
+# - study:data:pending      : 저장할 엔트리가 남아 있는 세션 id 집합
+# - study:data:flushing     : flusher가 처리 중인 세션 id 집합 (flusher가 죽으면 recover로 되돌린다)
+STREAM_KEY = "study:data:{session_id}"
+PENDING_KEY = "study:data:pending"
+FLUSHING_KEY = "study:data:flushing"
+
+# 스트림이 비어 있을 때만 키를 지운다 (그 사이 새로 추가된 엔트리를 지우지 않도록)
+DELETE_IF_EMPTY = """
+if redis.call('XLEN', KEYS[1]) == 0 then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class StudyDataStream:
+    def __init__(self, redis: redis.Redis):
+        self.redis = redis
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return STREAM_KEY.format(session_id=session_id)
+
+    @staticmethod
+    def _dump(datas: list[StudyData]) -> str:
+        return json.dumps([
+            [data.id, data.ppg_value, data.focus_score, data.time.isoformat(), data.created_at.isoformat()]
+            for data in datas
+        ])
+
+    @staticmethod
+    def _load(session_id: str, payload: bytes | str) -> list[StudyData]:
+        return [
+            StudyData(
+                id = id,
+                session_id = session_id,
+                ppg_value = ppg_value,
+                focus_score = focus_score,
+                time = datetime.fromisoformat(time),
+                created_at = datetime.fromisoformat(created_at),
+            )
+            for id, ppg_value, focus_score, time, created_at in json.loads(payload)
+        ]
+
+    def _parse(self, session_id: str, entries) -> list[tuple[str, str, list[StudyData]]]:
+        parsed = []
+        for entry_id, fields in entries:
+            fields = {_decode(key): value for key, value in fields.items()}
+            parsed.append((
+                _decode(entry_id),
+                _decode(fields["user_id"]),
+                self._load(session_id, fields["datas"]),
+            ))
+        return parsed
+
+    # 업로드 한 번을 스트림 엔트리 하나로 추가한다.
+    # XADD 다음에 SADD를 실행해야 flusher가 세션을 놓치지 않는다.
+    async def append(self, user_id: str, session_id: str, datas: list[StudyData]):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(self._key(session_id), {"user_id": user_id, "datas": self._dump(datas)})
+            pipe.sadd(PENDING_KEY, session_id)
+            await pipe.execute()
+
+    # 아직 저장되지 않은 샘플 (해당 유저가 올린 것만)
+    async def tail(self, user_id: str, session_id: str) -> list[StudyData]:
+        entries = await self.redis.xrange(self._key(session_id))
+        return [
+            data
+            for _, owner_id, datas in self._parse(session_id, entries)
+            if owner_id == user_id
+            for data in datas
+        ]
+
+    # 처리할 세션을 pending에서 flushing으로 옮겨 가져온다.
+    async def claim(self, count: int) -> list[str]:
+        session_ids = await self.redis.srandmember(PENDING_KEY, count)
+        claimed = []
+        for session_id in session_ids:
+            if await self.redis.smove(PENDING_KEY, FLUSHING_KEY, session_id):
+                claimed.append(_decode(session_id))
+        return claimed
+
+    async def read(self, session_id: str, count: int) -> list[tuple[str, str, list[StudyData]]]:
+        entries = await self.redis.xrange(self._key(session_id), count=count)
+        return self._parse(session_id, entries)
+
+    # MySQL 저장이 끝난 엔트리만 삭제한다.
+    async def ack(self, session_id: str, entry_ids: list[str]):
+        if entry_ids:
+            await self.redis.xdel(self._key(session_id), *entry_ids)
+
+    # 세션을 모두 비웠으면 처리 중 표시를 지운다.
+    async def release(self, session_id: str):
+        await self.redis.eval(DELETE_IF_EMPTY, 1, self._key(session_id))
+        await self.redis.srem(FLUSHING_KEY, session_id)
+
+    # 저장에 실패한 세션은 다음 주기에 다시 처리한다.
+    async def requeue(self, session_id: str):
+        await self.redis.smove(FLUSHING_KEY, PENDING_KEY, session_id)
+
+    # flusher 시작 시 이전 프로세스가 처리하다 만 세션을 되돌린다.
+    async def recover(self):
+        for session_id in await self.redis.smembers(FLUSHING_KEY):
+            await self.redis.smove(FLUSHING_KEY, PENDING_KEY, session_id)
+
+    # 세션 삭제 시 남은 샘플도 버린다.
+    async def discard(self, session_id: str):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(self._key(session_id))
+            pipe.srem(PENDING_KEY, session_id)
+            await pipe.execute()
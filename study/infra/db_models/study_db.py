@@ -1,10 +1,14 @@
 from database import Base
 from datetime import datetime
-from sqlalchemy import String, DateTime, Column, ForeignKey, Float, TIMESTAMP
+from sqlalchemy import String, Date, DateTime, Column, ForeignKey, Float, TIMESTAMP, Index, Integer, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.mysql import DATETIME
 from sqlalchemy.orm import relationship
+from config import get_settings
 # from user.infra.db_models.user import User
 import pytz
 
+settings = get_settings()
+
 # 한국 시간대 객체 생성 (pytz 사용)
 korea_timezone = pytz.timezone('Asia/Seoul')
 
@@ -13,6 +17,8 @@ def get_korea_now():
 
 class StudySession(Base):
     __tablename__ = "StudySession"
+    # 날짜별 세션 조회(달력)는 user_id + created_at 범위로 찾는다
+    __table_args__ = (Index("ix_studysession_user_created", "user_id", "created_at"),)
 
     id = Column(String(36), primary_key=True)
     user_id = Column(String(36), ForeignKey("User.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -27,11 +33,15 @@ class StudySession(Base):
 
     # all, delete-orphan옵션에 의해 StudySession 객체가 삭제될때 연관된 StudyData 객체들도 자동으로 삭제
     study_data = relationship("StudyData", back_populates="study_session", cascade="all, delete-orphan")
+    # 블록 저장소(StudyDataChunk)는 DB의 ON DELETE CASCADE로 삭제한다 (블록을 불러오지 않음)
+    study_data_chunks = relationship("StudyDataChunk", back_populates="study_session", cascade="all, delete-orphan", passive_deletes=True)
     subject_obj = relationship("Subject", back_populates="study_sessions")
     user = relationship("User", back_populates="study_sessions")
 
 class StudyData(Base):
     __tablename__ = "StudyData"
+    # 세션별 시간순 조회용 인덱스. DATA_UNIQUE_TIME이면 같은 측정 시간의 샘플은 하나만 저장한다 (재전송 중복 방지)
+    __table_args__ = (Index("ix_studydata_session_time", "session_id", "time", unique=settings.data_unique_time),)
 
     id = Column(String(36), primary_key=True)
     session_id = Column(String(36), ForeignKey("StudySession.id", ondelete="CASCADE"), nullable=False)
@@ -42,6 +52,34 @@ class StudyData(Base):
 
     study_session = relationship("StudySession", back_populates="study_data")
 
+# 세션의 샘플을 고정 크기 구간으로 묶어 압축 저장하는 블록 (study.infra.chunk_codec 참고)
+class StudyDataChunk(Base):
+    __tablename__ = "StudyDataChunk"
+    __table_args__ = (UniqueConstraint("session_id", "seq"),)
+
+    id = Column(String(36), primary_key=True)
+    session_id = Column(String(36), ForeignKey("StudySession.id", ondelete="CASCADE"), nullable=False)
+    seq = Column(Integer, nullable=False)                    # 세션 내 블록 순서
+    start_time = Column(DATETIME(fsp=6), nullable=False)     # 블록 첫 샘플의 측정 시간 (샘플 시간은 여기에 차이를 더해 복원하므로 마이크로초까지 저장)
+    count = Column(Integer, nullable=False)                  # 블록에 담긴 샘플 수
+    payload = Column(LargeBinary(length=2**24), nullable=False)
+    created_at = Column(DATETIME(fsp=6), nullable=False, default=get_korea_now)
+
+    study_session = relationship("StudySession", back_populates="study_data_chunks")
+
+# 유저의 날짜별 학습 요약 (세션 생성/종료/삭제 시 같은 트랜잭션에서 증감)
+# 날짜는 세션 created_at의 날짜이고, 평균 집중도는 focus_sum / focus_count 이다.
+class StudyDailySummary(Base):
+    __tablename__ = "StudyDailySummary"
+
+    user_id = Column(String(36), ForeignKey("User.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    total_duration = Column(Integer, nullable=False, default=0)   # 종료된 세션의 학습 시간 합 (초)
+    focus_sum = Column(Float, nullable=False, default=0)          # avg_focus가 있는 세션의 avg_focus 합
+    focus_count = Column(Integer, nullable=False, default=0)      # avg_focus가 있는 세션 수
+    updated_at = Column(DateTime(6), nullable=False, default=get_korea_now, onupdate=get_korea_now)
+
 class Subject(Base):
     __tablename__ = "Subject"
     id = Column(String(36), primary_key=True)
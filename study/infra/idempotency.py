@@ -0,0 +1,34 @@
+import redis.asyncio as redis
+
+# Idempotency-Key 헤더로 같은 업로드 묶음의 재전송을 걸러낸다.
+# 키 하나당 Redis 값 하나(study:idempotency:{user_id}:{key})를 TTL과 함께 둔다.
+# - pending: 처음 받은 요청을 처리 중
+# - done:    저장 완료 (재전송은 저장 없이 응답)
+IDEMPOTENCY_KEY = "study:idempotency:{user_id}:{key}"
+PENDING = "pending"
+DONE = "done"
+
+
+class IdempotencyStore:
+    def __init__(self, redis: redis.Redis, ttl: int = 86400):
+        self.redis = redis
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: str, key: str) -> str:
+        return IDEMPOTENCY_KEY.format(user_id=user_id, key=key)
+
+    # 처음 보는 키면 선점하고 None, 이미 있으면 그 상태(pending/done)를 반환한다.
+    # SET NX GET (Redis 7+)으로 선점과 조회를 한 번에 처리한다.
+    async def claim(self, user_id: str, key: str) -> str | None:
+        state = await self.redis.set(self._key(user_id, key), PENDING, nx=True, get=True, ex=self.ttl)
+        if state is None:
+            return None
+        return state.decode("utf-8") if isinstance(state, bytes) else state
+
+    async def complete(self, user_id: str, key: str):
+        await self.redis.set(self._key(user_id, key), DONE, ex=self.ttl)
+
+    # 처리에 실패하면 키를 풀어 재전송이 다시 저장되도록 한다.
+    async def release(self, user_id: str, key: str):
+        await self.redis.delete(self._key(user_id, key))
@@ -0,0 +1,105 @@
+from dataclasses import asdict
+from common.read_cache import ReadCache
+from database import after_commit
+from study.domain.repository.study_repo import IStudy
+from study.domain.study import StudySession, StudyDataColumns, Subject
+
+SUBJECTS_KEY = "cache:study:subjects:{user_id}"
+SESSION_DATES_KEY = "cache:study:dates:{user_id}"
+
+
+def _encode_subjects(subjects: list[Subject] | None) -> list[dict] | None:
+    return None if subjects is None else [asdict(subject) for subject in subjects]
+
+
+def _decode_subjects(values: list[dict] | None) -> list[Subject] | None:
+    return None if values is None else [Subject(**value) for value in values]
+
+
+class CachedStudyRepository:
+    """
+    IStudy 구현체를 감싸 과목 목록과 학습 날짜 조회를 ReadCache에 캐시한다.
+    - get_subjects / find_by_subject_name: 유저별 과목 목록 하나를 캐시해서 함께 사용
+    - get_session_dates: 유저별 학습 날짜
+    값을 바꾸는 메서드는 원래 저장소에 위임한 뒤 해당 유저의 키를 무효화한다. (요청 단위 작업 안에서는 커밋된 뒤에)
+    캐시하지 않는 나머지 메서드는 그대로 원래 저장소로 전달된다.
+    """
+
+    def __init__(self, repo: IStudy, cache: ReadCache):
+        self.repo = repo
+        self.cache = cache
+
+    def __getattr__(self, name: str):
+        return getattr(self.repo, name)
+
+    async def get_subjects(self, user_id: str) -> list[Subject] | None:
+        return await self.cache.get_or_load(
+            SUBJECTS_KEY.format(user_id=user_id),
+            lambda: self.repo.get_subjects(user_id = user_id),
+            _encode_subjects,
+            _decode_subjects,
+        )
+
+    # create_session마다 호출되므로 캐시된 과목 목록에서 먼저 찾는다.
+    # 이름이 정확히 같지 않으면 DB 비교 규칙(collation)대로 찾도록 원래 저장소에 맡긴다.
+    async def find_by_subject_name(self, user_id: str, subject_name: str) -> Subject:
+        for subject in await self.get_subjects(user_id = user_id) or []:
+            if subject.subject_name == subject_name:
+                return subject
+        return await self.repo.find_by_subject_name(user_id = user_id, subject_name = subject_name)
+
+    async def save_subject(self, user_id: str, subject: Subject) -> Subject:
+        try:
+            return await self.repo.save_subject(user_id = user_id, subject = subject)
+        finally:
+            await after_commit(lambda: self.cache.invalidate(SUBJECTS_KEY.format(user_id=user_id)))
+
+    async def update_subject(self, user_id: str, subject: Subject) -> Subject:
+        try:
+            return await self.repo.update_subject(user_id = user_id, subject = subject)
+        finally:
+            await after_commit(lambda: self.cache.invalidate(SUBJECTS_KEY.format(user_id=user_id)))
+
+    async def delete_subject(self, user_id: str, subject: Subject):
+        try:
+            await self.repo.delete_subject(user_id = user_id, subject = subject)
+        finally:
+            await after_commit(lambda: self.cache.invalidate(SUBJECTS_KEY.format(user_id=user_id)))
+
+    async def get_session_dates(self, user_id: str) -> tuple[int, list[str]]:
+        count, dates = await self.cache.get_or_load(
+            SESSION_DATES_KEY.format(user_id=user_id),
+            lambda: self.repo.get_session_dates(user_id = user_id),
+            list,
+            tuple,
+        )
+        return count, dates
+
+    async def save_session(self, user_id: str, session: StudySession) -> StudySession:
+        try:
+            return await self.repo.save_session(user_id = user_id, session = session)
+        finally:
+            await after_commit(lambda: self.cache.invalidate(SESSION_DATES_KEY.format(user_id=user_id)))
+
+    async def save_session_archive(self, user_id: str, session: StudySession, columns: StudyDataColumns) -> StudySession:
+        try:
+            return await self.repo.save_session_archive(user_id = user_id, session = session, columns = columns)
+        finally:
+            await after_commit(lambda: self.cache.invalidate(SESSION_DATES_KEY.format(user_id=user_id)))
+
+    async def delete_session(self, user_id: str, session_id: str):
+        try:
+            await self.repo.delete_session(user_id = user_id, session_id = session_id)
+        finally:
+            await after_commit(lambda: self.cache.invalidate(SESSION_DATES_KEY.format(user_id=user_id)))
+
+    async def rebuild_daily_summaries(self, user_id: str | None = None) -> int:
+        count = await self.repo.rebuild_daily_summaries(user_id = user_id)
+        # 전체 재계산은 유저별 키를 모두 알 수 없으므로 캐시 TTL이 지나면 반영된다.
+        if user_id is not None:
+            await after_commit(lambda: self.cache.invalidate(SESSION_DATES_KEY.format(user_id=user_id)))
+        return count
+
+
+# 추상 메서드를 모두 위임하므로 IStudy 구현체로 등록한다.
+IStudy.register(CachedStudyRepository)
@@ -0,0 +1,199 @@
+from itertools import groupby
+from typing import AsyncIterator
+from sqlalchemy import insert
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from ulid import ULID
+from database import AsyncSessionLocal, commit, get_db_session
+from study.domain.study import StudyData, StudyDataColumns
+from study.infra.chunk_codec import can_append, decode_chunk, encode_chunk, normalize, split_windows
+from study.infra.db_models.study_db import StudySession as Session_db
+from study.infra.db_models.study_db import StudyDataChunk as Chunk_db
+from study.infra.repository.study_repo import StudyRepository
+
+# 집중도 데이터를 샘플 단위 행(StudyData) 대신 세션별 압축 블록(StudyDataChunk)으로 저장하는 저장소
+# 세션/과목 관련 메서드는 StudyRepository를 그대로 사용한다.
+class ChunkedStudyRepository(StudyRepository):
+    # window_size: 블록 하나에 담을 최대 샘플 수
+    def __init__(self, chunk_size: int = 1000, window_size: int = 256, unique_time: bool = False, float_fetch: bool = True):
+        super().__init__(chunk_size = chunk_size, unique_time = unique_time, float_fetch = float_fetch)
+        self.window_size = window_size
+        self.ulid = ULID()
+
+    # 세션의 블록들을 순서대로 읽어 샘플로 풀어서 반환
+    async def find_datas_by_session_id(self, user_id: str, session_id: str) -> list[StudyData]:
+        async with get_db_session() as db:
+            query = (
+                select(Chunk_db)
+                .join(Session_db)
+                .where(Session_db.user_id == user_id, Chunk_db.session_id == session_id)
+                .order_by(Chunk_db.seq)
+            )
+            result = await db.execute(query)
+            chunks = result.scalars().all()
+
+        datas = []
+        for chunk in chunks:
+            datas.extend(self._chunk_datas(chunk))
+
+        return datas
+
+    async def find_datas_by_session_ids(self, user_id: str, session_ids: list[str]) -> dict[str, list[StudyData]]:
+        datas = {}
+        if not session_ids:
+            return datas
+
+        async with get_db_session() as db:
+            query = (
+                select(Chunk_db)
+                .join(Session_db)
+                .where(Session_db.user_id == user_id, Chunk_db.session_id.in_(session_ids))
+                .order_by(Chunk_db.session_id, Chunk_db.seq)
+            )
+            result = await db.execute(query)
+            for chunk in result.scalars().all():
+                datas.setdefault(chunk.session_id, []).extend(self._chunk_datas(chunk))
+
+        return datas
+
+    # 블록을 서버 측 커서로 하나씩 읽어 풀어서 반환한다. (batch_size는 샘플 수 기준)
+    async def stream_datas_by_session_id(self, user_id: str, session_id: str, batch_size: int = 1000) -> AsyncIterator[StudyData]:
+        # 응답 본문을 보내는 동안 커서를 유지해야 하므로 요청 단위 세션이 아닌 별도 세션을 쓴다.
+        async with AsyncSessionLocal() as db:
+            query = (
+                select(Chunk_db)
+                .join(Session_db)
+                .where(Session_db.user_id == user_id, Chunk_db.session_id == session_id)
+                .order_by(Chunk_db.seq)
+                .execution_options(yield_per=max(batch_size // self.window_size, 1))
+            )
+            result = await db.stream_scalars(query)
+            async for chunk in result:
+                for data in self._chunk_datas(chunk):
+                    yield data
+
+    @staticmethod
+    def _chunk_datas(chunk: Chunk_db) -> list[StudyData]:
+        samples = decode_chunk(chunk.start_time, chunk.count, chunk.payload)
+        return [
+            StudyData(
+                id = f"{chunk.id}-{index}",
+                session_id = chunk.session_id,
+                ppg_value = ppg_value,
+                focus_score = focus_score,
+                time = time,
+                created_at = chunk.created_at,
+            )
+            for index, (time, ppg_value, focus_score) in enumerate(samples)
+        ]
+
+    # 블록에서 꺼낸 샘플의 id는 블록 id로 만든 값이라 원래 id와 다르다.
+    # 블록에는 시간대 없이 저장되므로 시간대를 뗀 측정 시간으로 비교한다.
+    def sample_key(self, data: StudyData):
+        return data.time.replace(tzinfo=None) if data.time.tzinfo else data.time
+
+    # 블록에 담긴 샘플 수의 합
+    def _sample_count(self):
+        return (
+            select(func.coalesce(func.sum(Chunk_db.count), 0))
+            .where(Chunk_db.session_id == Session_db.id)
+            .scalar_subquery()
+        )
+
+    # 블록은 DB에서 집계할 수 없으므로 풀어서 구간별 평균을 계산한다.
+    async def find_data_buckets(self, user_id: str, session_id: str, bucket_seconds: int) -> list[StudyData]:
+        buckets: dict[int, list[StudyData]] = {}
+        for data in await self.find_datas_by_session_id(user_id = user_id, session_id = session_id):
+            buckets.setdefault(int(data.time.timestamp() // bucket_seconds), []).append(data)
+
+        return [
+            StudyData(
+                id = f"{session_id}:{bucket}",
+                session_id = session_id,
+                ppg_value = sum(data.ppg_value for data in datas) / len(datas),
+                focus_score = sum(data.focus_score for data in datas) / len(datas),
+                time = datas[0].time,
+                created_at = datas[0].created_at,
+            )
+            for bucket, datas in sorted(buckets.items())
+        ]
+
+    # 샘플을 세션별로 블록에 담아 저장한다. 마지막 블록이 덜 찼으면 이어서 채운다.
+    # 블록에는 샘플 id가 없으므로 ignore_duplicates이면 마지막으로 저장된 시간 이하의 샘플을 건너뛴다.
+    async def save_data(self, user_id: str, datas: list[StudyData], ignore_duplicates: bool = False) -> list[StudyData]:
+        if not datas:
+            return datas
+
+        async with get_db_session() as db:
+            for session_id, session_datas in groupby(datas, key=lambda data: data.session_id):
+                session_datas = list(session_datas)
+                samples = normalize([(data.time, data.ppg_value, data.focus_score) for data in session_datas])
+                await self._append_samples(db, session_id, samples, session_datas[0].created_at, ignore_duplicates or self.unique_time)
+            await commit(db)
+
+        return datas
+
+    async def save_data_columns(self, user_id: str, columns: StudyDataColumns, ignore_duplicates: bool = False) -> list[dict]:
+        if not len(columns):
+            return []
+
+        samples = normalize(list(zip(columns.times, columns.ppg_values, columns.focus_scores)))
+        async with get_db_session() as db:
+            await self._append_samples(db, columns.session_id, samples, columns.created_at, ignore_duplicates or self.unique_time)
+            await commit(db)
+
+        return columns.rows()
+
+    # 세션 저장(StudyRepository.save_session_archive)과 같은 트랜잭션에서 샘플을 블록으로 저장한다.
+    async def _execute_data_columns(self, db, columns: StudyDataColumns):
+        if len(columns):
+            samples = normalize(list(zip(columns.times, columns.ppg_values, columns.focus_scores)))
+            await self._append_samples(db, columns.session_id, samples, columns.created_at)
+
+    async def _append_samples(self, db, session_id: str, samples: list, created_at, ignore_duplicates: bool = False):
+        # 같은 세션에 동시에 쓰는 경우를 막기 위해 마지막 블록을 잠근다.
+        query = (
+            select(Chunk_db)
+            .where(Chunk_db.session_id == session_id)
+            .order_by(Chunk_db.seq.desc())
+            .limit(1)
+            .with_for_update()
+        )
+        result = await db.execute(query)
+        last = result.scalars().first()
+
+        seq = 0
+        merge = False
+        if last is not None:
+            seq = last.seq + 1
+            if ignore_duplicates or last.count < self.window_size:
+                previous = decode_chunk(last.start_time, last.count, last.payload)
+            if ignore_duplicates:
+                samples = [sample for sample in samples if sample[0] > previous[-1][0]]
+                if not samples:
+                    return
+            if last.count < self.window_size and can_append(previous, samples[0]):
+                samples = previous + samples
+                merge = True
+
+        windows = split_windows(samples, self.window_size)
+
+        # 덜 찬 마지막 블록은 새 샘플을 합쳐 다시 인코딩한다.
+        if merge:
+            last.start_time, last.count, last.payload = encode_chunk(windows.pop(0))
+
+        rows = []
+        for offset, window in enumerate(windows):
+            start_time, count, payload = encode_chunk(window)
+            rows.append({
+                "id": self.ulid.generate(),
+                "session_id": session_id,
+                "seq": seq + offset,
+                "start_time": start_time,
+                "count": count,
+                "payload": payload,
+                "created_at": created_at,
+            })
+
+        if rows:
+            await db.execute(insert(Chunk_db.__table__), rows)
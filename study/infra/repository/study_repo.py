@@ -1,98 +1,420 @@
+from collections import defaultdict
+from functools import lru_cache
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator
 from fastapi import HTTPException
+from sqlalchemy import bindparam, delete, insert, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 from sqlalchemy.sql import func
-from database import AsyncSessionLocal
-from study.domain.study import StudySession, StudyData, Subject
+from database import AsyncSessionLocal, commit, get_db_session
+from study.domain.study import StudyDailySummary, StudySession, StudyData, StudyDataColumns, Subject
 from study.domain.repository.study_repo import IStudy
 from study.infra.db_models.study_db import StudySession as Session_db
 from study.infra.db_models.study_db import StudyData as Data_db
+from study.infra.db_models.study_db import StudyDailySummary as Summary_db
 from study.infra.db_models.study_db import Subject as SubjectDB
-from utils.db_utils import row_to_dict
+from utils.db_utils import RowMapper, row_to_dict, update_returning
+
+
+def _parse_time(value: str | datetime | None) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+# 세션이 날짜별 요약에 더하는 값: (학습 시간(초), focus 합, focus 개수)
+# start_time/end_time은 클라이언트가 보낸 문자열이므로 해석할 수 없으면 학습 시간은 0으로 본다.
+def _summary_values(start_time, end_time, avg_focus) -> tuple[int, float, int]:
+    duration = 0
+    start, end = _parse_time(start_time), _parse_time(end_time)
+    if start is not None and end is not None:
+        try:
+            duration = max(int((end - start).total_seconds()), 0)
+        except TypeError:   # 시간대가 있는 값과 없는 값이 섞인 경우
+            duration = 0
+
+    if avg_focus is None:
+        return duration, 0.0, 0
+    return duration, float(avg_focus), 1
+
+
+def _session_date(created_at: str | datetime) -> date:
+    return _parse_time(created_at).date()
+
+
+class _Statements:
+    """
+    요청마다 호출되는 조회 문장을 한 번만 만들어 둔다. 값은 bindparam으로 실행할 때 넘긴다.
+    select()를 호출마다 다시 만들고 캐시 키를 계산하는 비용을 줄이고, 컴파일된 SQL은 엔진의 캐시에서 재사용된다.
+    """
+
+    def __init__(self, float_fetch: bool):
+        self.session_mapper = RowMapper(StudySession, Session_db, float_fetch = float_fetch)
+        self.data_mapper = RowMapper(StudyData, Data_db, float_fetch = float_fetch)
+        self.subject_mapper = RowMapper(Subject, SubjectDB)
+
+        self.session_by_id = (
+            select(*self.session_mapper.columns)
+            .where(Session_db.user_id == bindparam("user_id"), Session_db.id == bindparam("session_id"))
+        )
+        self.datas_by_session = (
+            select(*self.data_mapper.columns)
+            .join(Session_db)
+            .where(Session_db.user_id == bindparam("user_id"), Data_db.session_id == bindparam("session_id"))
+            .order_by(Data_db.time)
+        )
+        self.subject_by_name = (
+            select(*self.subject_mapper.columns)
+            .where(SubjectDB.user_id == bindparam("user_id"), SubjectDB.subject_name == bindparam("subject_name"))
+            .limit(1)
+        )
+
+
+# 저장소는 요청마다 새로 만들어지므로(Factory) 문장은 float_fetch별로 모듈에 한 번만 만든다.
+@lru_cache
+def _statements(float_fetch: bool) -> _Statements:
+    return _Statements(float_fetch)
 
 class StudyRepository(IStudy):
+    # chunk_size: save_data에서 INSERT 한 번에 묶어 보낼 최대 행 수
+    # unique_time: (session_id, time)이 이미 있는 샘플은 항상 INSERT IGNORE로 건너뛴다.
+    # float_fetch: 세션/샘플 목록 조회에서 Float(asdecimal=True) 컬럼을 Decimal 대신 float로 받는다.
+    def __init__(self, chunk_size: int = 1000, unique_time: bool = False, float_fetch: bool = True):
+        self.chunk_size = chunk_size
+        self.unique_time = unique_time
+        self.statements = _statements(float_fetch)
+        self.session_mapper = self.statements.session_mapper
+        self.data_mapper = self.statements.data_mapper
+
     # db에서 학습 세션을 조회
-    async def get_sessions(self, user_id: str, page: int, items_per_page:int) -> tuple[int, list[StudySession]]:
-        async with AsyncSessionLocal() as db:
+    # window이면 COUNT(*) OVER()로 전체 개수와 페이지를 쿼리 한 번에 가져온다.
+    async def get_sessions(self, user_id: str, page: int, items_per_page:int, window: bool = False) -> tuple[int, list[StudySession]]:
+        if window:
+            async with get_db_session() as db:
+                query = (
+                    select(*self.session_mapper.columns, func.count().over().label("total_count"))
+                    .where(Session_db.user_id == user_id)
+                    .order_by(Session_db.id)
+                    .offset((page - 1) * items_per_page)
+                    .limit(items_per_page)
+                )
+                rows = (await db.execute(query)).all()
+
+            # 마지막 페이지를 넘어가면 행이 없어 전체 개수를 알 수 없으므로 따로 센다.
+            if not rows and page > 1:
+                return await self.count_sessions(user_id = user_id), []
+            total_count = rows[0].total_count if rows else 0
+            return total_count, self.session_mapper.all(row[:-1] for row in rows)
+
+        async with get_db_session() as db:
             total_count_query = select(func.count()).select_from(Session_db).where(Session_db.user_id == user_id)
             total_count_result = await db.execute(total_count_query)
             total_count = total_count_result.scalar()
             
             query = (
-                select(Session_db)
+                select(*self.session_mapper.columns)
                 .where(Session_db.user_id == user_id)
+                .order_by(Session_db.id)
                 .offset((page - 1) * items_per_page)
                 .limit(items_per_page)
             )
 
             result = await db.execute(query)
-            sessions = result.scalars().all()
+            sessions = self.session_mapper.all(result)
         
-        return total_count, [StudySession(**row_to_dict(session)) for session in sessions]
+        return total_count, sessions
+
+    # 전체 개수 없이 페이지만 조회 (include_total=false이거나 개수를 캐시에서 가져오는 경우)
+    async def get_sessions_page(self, user_id: str, offset: int, limit: int) -> list[StudySession]:
+        async with get_db_session() as db:
+            query = (
+                select(*self.session_mapper.columns)
+                .where(Session_db.user_id == user_id)
+                .order_by(Session_db.id)
+                .offset(offset)
+                .limit(limit)
+            )
+
+            result = await db.execute(query)
+            return self.session_mapper.all(result)
+
+    # user_id 인덱스(user_id, id) 안에서 after_id 다음부터 읽으므로 앞 페이지를 건너뛰는 비용이 없다.
+    async def get_sessions_after(self, user_id: str, after_id: str | None, limit: int) -> list[StudySession]:
+        async with get_db_session() as db:
+            query = select(*self.session_mapper.columns).where(Session_db.user_id == user_id)
+            if after_id is not None:
+                query = query.where(Session_db.id > after_id)
+            query = query.order_by(Session_db.id).limit(limit)
+
+            result = await db.execute(query)
+            return self.session_mapper.all(result)
+
+    async def count_sessions(self, user_id: str) -> int:
+        async with get_db_session() as db:
+            query = select(func.count()).select_from(Session_db).where(Session_db.user_id == user_id)
+            result = await db.execute(query)
+            return result.scalar()
     
+    # 세션 대신 날짜별 요약(StudyDailySummary)을 읽으므로 학습한 날 수만큼의 행만 읽는다.
     async def get_session_dates(self, user_id:str) -> tuple[int, list[str]]:
-        async with AsyncSessionLocal() as db:
+        async with get_db_session() as db:
             query = (
-                select(func.date(Session_db.created_at))
-                .where(Session_db.user_id == user_id)
+                select(Summary_db.date)
+                .where(Summary_db.user_id == user_id, Summary_db.session_count > 0)
+                .order_by(Summary_db.date)
             )
             
             result = await db.execute(query)
-            dates = result.scalars().all()
-            
-            res_date = []
-            for date in dates:
-                if str(date) in res_date:
-                    continue
-                res_date.append(str(date))
+            dates = [str(date) for date in result.scalars().all()]
         
-        return len(res_date), list(res_date)
+        return len(dates), dates
 
-    async def get_sessions_by_date(self, user_id: str, date: str) -> tuple[int, list[StudySession]]:
+    # 날짜별 학습 요약 조회 (start_date/end_date는 포함, None이면 제한 없음)
+    async def get_daily_summaries(
+        self,
+        user_id: str,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[StudyDailySummary]:
+        async with get_db_session() as db:
+            query = select(Summary_db).where(Summary_db.user_id == user_id, Summary_db.session_count > 0)
+            if start_date is not None:
+                query = query.where(Summary_db.date >= start_date)
+            if end_date is not None:
+                query = query.where(Summary_db.date <= end_date)
+            result = await db.execute(query.order_by(Summary_db.date))
+            summaries = result.scalars().all()
+
+        return [
+            StudyDailySummary(
+                date = str(summary.date),
+                session_count = summary.session_count,
+                total_duration = summary.total_duration,
+                avg_focus = summary.focus_sum / summary.focus_count if summary.focus_count else None,
+            )
+            for summary in summaries
+        ]
+
+    # 날짜별 요약을 세션 테이블에서 다시 계산한다. (user_id가 None이면 전체 유저, 반환값은 요약 행 수)
+    # 세션은 서버 측 커서로 읽으므로 메모리에는 (유저, 날짜)별 합계만 올라간다.
+    # 관리용 일괄 작업이라 요청 단위 세션과 섞이지 않도록 별도 세션에서 바로 커밋한다.
+    async def rebuild_daily_summaries(self, user_id: str | None = None) -> int:
+        totals = defaultdict(lambda: [0, 0, 0.0, 0])
         async with AsyncSessionLocal() as db:
+            query = select(
+                Session_db.user_id,
+                Session_db.created_at,
+                Session_db.start_time,
+                Session_db.end_time,
+                Session_db.avg_focus,
+            ).execution_options(yield_per=self.chunk_size)
+            clear = delete(Summary_db)
+            if user_id is not None:
+                query = query.where(Session_db.user_id == user_id)
+                clear = clear.where(Summary_db.user_id == user_id)
+
+            result = await db.stream(query)
+            async for row in result:
+                total = totals[(row.user_id, _session_date(row.created_at))]
+                duration, focus_sum, focus_count = _summary_values(row.start_time, row.end_time, row.avg_focus)
+                total[0] += 1
+                total[1] += duration
+                total[2] += focus_sum
+                total[3] += focus_count
+
+            now = datetime.now()
+            rows = [
+                {
+                    "user_id": summary_user_id,
+                    "date": summary_date,
+                    "session_count": session_count,
+                    "total_duration": total_duration,
+                    "focus_sum": focus_sum,
+                    "focus_count": focus_count,
+                    "updated_at": now,
+                }
+                for (summary_user_id, summary_date), (session_count, total_duration, focus_sum, focus_count) in totals.items()
+            ]
+
+            await db.execute(clear)
+            for start in range(0, len(rows), self.chunk_size):
+                await db.execute(insert(Summary_db.__table__), rows[start:start + self.chunk_size])
+            await db.commit()
+
+        return len(rows)
+
+    # 날짜별 요약에 증감분을 더한다. (INSERT ... ON DUPLICATE KEY UPDATE로 동시 요청에도 원자적으로 누적)
+    async def _add_daily_summary(
+        self,
+        db,
+        user_id: str,
+        session_date: date,
+        session_count: int,
+        values: tuple[int, float, int],
+    ):
+        total_duration, focus_sum, focus_count = values
+        statement = mysql_insert(Summary_db).values(
+            user_id = user_id,
+            date = session_date,
+            session_count = session_count,
+            total_duration = total_duration,
+            focus_sum = focus_sum,
+            focus_count = focus_count,
+            updated_at = datetime.now(),
+        )
+        statement = statement.on_duplicate_key_update(
+            session_count = Summary_db.session_count + statement.inserted.session_count,
+            total_duration = Summary_db.total_duration + statement.inserted.total_duration,
+            focus_sum = Summary_db.focus_sum + statement.inserted.focus_sum,
+            focus_count = Summary_db.focus_count + statement.inserted.focus_count,
+            updated_at = statement.inserted.updated_at,
+        )
+        await db.execute(statement)
+
+    # created_at에 함수를 씌우지 않고 [해당 날짜 0시, 다음 날 0시) 범위로 비교해야 인덱스를 사용한다.
+    async def get_sessions_by_date(self, user_id: str, date: str) -> tuple[int, list[StudySession]]:
+        try:
+            start = datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+        end = start + timedelta(days=1)
+
+        async with get_db_session() as db:
             query = (
-                select(Session_db)
+                select(*self.session_mapper.columns)
                 .where(
                     Session_db.user_id == user_id,
-                    func.date(Session_db.created_at) == date
+                    Session_db.created_at >= start,
+                    Session_db.created_at < end,
                 )
+                .order_by(Session_db.created_at)
             )
             
             result = await db.execute(query)
-            sessions = result.scalars().all()
+            sessions = self.session_mapper.all(result)
         
-        return len(sessions), [StudySession(**row_to_dict(session)) for session in sessions]
+        return len(sessions), sessions
 
     # StudyData db에서 세션 id에 해당하는 집중도 데이터 조회
     async def find_datas_by_session_id(self, user_id: str, session_id: str) -> list[StudyData]:
-        async with AsyncSessionLocal() as db:
+        async with get_db_session() as db:
+            result = await db.execute(self.statements.datas_by_session, {"user_id": user_id, "session_id": session_id})
+            return self.data_mapper.all(result)
+
+    # 세션 소유자 확인(Session_db.user_id)과 IN 조건을 한 쿼리로 처리한다.
+    async def find_datas_by_session_ids(self, user_id: str, session_ids: list[str]) -> dict[str, list[StudyData]]:
+        datas = {}
+        if not session_ids:
+            return datas
+
+        async with get_db_session() as db:
             query = (
-                select(Data_db)
+                select(*self.data_mapper.columns)
                 .join(Session_db)
-                .where(Session_db.user_id == user_id, Data_db.session_id == session_id)
+                .where(Session_db.user_id == user_id, Data_db.session_id.in_(session_ids))
+                .order_by(Data_db.session_id, Data_db.time)
             )
             result = await db.execute(query)
-            datas = result.scalars().all()
-            if not datas:
-                return []
-        
-        return [StudyData(**row_to_dict(data)) for data in datas]
+            for data in self.data_mapper.all(result):
+                datas.setdefault(data.session_id, []).append(data)
 
-    # db에서 학습 세션을 조회 
-    async def find_session_by_id(self, user_id: str, session_id: str) -> StudySession:
+        return datas
+
+    # ORM 객체/identity map 없이 필요한 컬럼만 서버 측 커서(yield_per)로 읽는다.
+    # 세션 길이와 관계없이 메모리에는 batch_size 행만 올라간다.
+    async def stream_datas_by_session_id(self, user_id: str, session_id: str, batch_size: int = 1000) -> AsyncIterator[StudyData]:
+        # 응답 본문을 보내는 동안 커서를 유지해야 하므로 요청 단위 세션이 아닌 별도 세션을 쓴다.
         async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                self.statements.datas_by_session,
+                {"user_id": user_id, "session_id": session_id},
+                execution_options = {"yield_per": batch_size},
+            )
+            async for partition in result.partitions():
+                for data in self.data_mapper.all(partition):
+                    yield data
+
+    # bucket_seconds 초 단위 구간별 평균 (GROUP BY로 DB에서 집계)
+    # 구간의 time/created_at은 구간 첫 샘플 기준이고, id는 "{session_id}:{구간 번호}"이다.
+    async def find_data_buckets(self, user_id: str, session_id: str, bucket_seconds: int) -> list[StudyData]:
+        bucket = func.floor(func.unix_timestamp(Data_db.time) / bucket_seconds).label("bucket")
+        async with get_db_session() as db:
             query = (
-                select(Session_db).where(Session_db.user_id == user_id, Session_db.id == session_id)
+                select(
+                    bucket,
+                    func.min(Data_db.time).label("time"),
+                    func.avg(Data_db.ppg_value).label("ppg_value"),
+                    func.avg(Data_db.focus_score).label("focus_score"),
+                    func.min(Data_db.created_at).label("created_at"),
+                )
+                .join(Session_db)
+                .where(Session_db.user_id == user_id, Data_db.session_id == session_id)
+                .group_by(bucket)
+                .order_by(bucket)
             )
             result = await db.execute(query)
-            session = result.scalars().first()
+            rows = result.all()
+
+        return [
+            StudyData(
+                id = f"{session_id}:{int(row.bucket)}",
+                session_id = session_id,
+                ppg_value = float(row.ppg_value),
+                focus_score = float(row.focus_score),
+                time = row.time,
+                created_at = row.created_at,
+            )
+            for row in rows
+        ]
+
+    # db에서 학습 세션을 조회 
+    async def find_session_by_id(self, user_id: str, session_id: str) -> StudySession:
+        async with get_db_session() as db:
+            result = await db.execute(self.statements.session_by_id, {"user_id": user_id, "session_id": session_id})
+            session = result.first()
             if not session:
                 raise HTTPException(status_code = 422)
         
-        return StudySession(**row_to_dict(session))
+        return self.session_mapper.one(session)
+
+    # 진행 중인 세션(end_time 없음)은 버전(ETag)을 쓰지 않으므로 샘플 수를 세지 않는다. (count는 None)
+    # 끝난 세션만 샘플 수를 세며, (session_id, time) 인덱스만 세므로 샘플 행을 읽지 않는다.
+    async def find_session_version(self, user_id: str, session_id: str) -> tuple[str | None, datetime, int | None] | None:
+        async with get_db_session() as db:
+            query = select(
+                Session_db.end_time,
+                Session_db.updated_at,
+            ).where(Session_db.user_id == user_id, Session_db.id == session_id)
+            result = await db.execute(query)
+            row = result.first()
+            if row is None:
+                return None
+
+            end_time, updated_at = row
+            if end_time is None:
+                return end_time, updated_at, None
+
+            count = await db.scalar(select(self._sample_count()).where(Session_db.id == session_id))
+
+        return end_time, updated_at, int(count)
+
+    # 세션(Session_db)별 샘플 수 (상관 서브쿼리)
+    def _sample_count(self):
+        return (
+            select(func.count())
+            .select_from(Data_db)
+            .where(Data_db.session_id == Session_db.id)
+            .scalar_subquery()
+        )
 
     # 학습 세션을 db에 생성한다.(학습 시작)
     async def save_session(self, user_id:str, session: StudySession) -> StudySession:
-        async with AsyncSessionLocal() as db:
+        async with get_db_session() as db:
             new_session = Session_db(
                 id = session.id,
                 user_id = user_id,
@@ -106,64 +428,166 @@ class StudyRepository(IStudy):
                 updated_at = session.updated_at,
             )
             db.add(new_session)
-            await db.commit()
+            await self._add_daily_summary(
+                db,
+                user_id,
+                _session_date(session.created_at),
+                1,
+                _summary_values(session.start_time, session.end_time, session.avg_focus),
+            )
+            await commit(db)
             await db.refresh(new_session)
         return StudySession(**row_to_dict(new_session))
     
     # 학습 세션을 수정 (학습 종료)
+    # 날짜별 요약에 이전 값과의 차이를 반영해야 하므로 ORM 객체 대신 세션 행을 Core로 잠가 읽고 UPDATE 한 번으로 수정한다.
     async def update_session(self, user_id:str, session: StudySession) -> StudySession:
-        async with AsyncSessionLocal() as db:
-            query = select(Session_db).where(Session_db.user_id == user_id, Session_db.id == session.id)
-            result = await db.execute(query)
-            new_session = result.scalars().first()
+        where = [Session_db.user_id == user_id, Session_db.id == session.id]
+        values = {
+            "updated_at": session.updated_at,
+            "avg_focus": session.avg_focus,
+            "ai_avg_focus": session.ai_avg_focus,
+            "end_time": session.end_time,
+        }
+
+        async with get_db_session() as db:
+            result = await db.execute(select(*Session_db.__table__.c).where(*where).with_for_update())
+            row = result.first()
 
-            if not new_session:
+            if not row:
                 raise HTTPException(status_code = 422)
-            
-            new_session.updated_at = session.updated_at
-            new_session.avg_focus = session.avg_focus
-            new_session.ai_avg_focus = session.ai_avg_focus
-            new_session.end_time = session.end_time
 
-            await db.commit()
+            # 이전 값과의 차이만 날짜별 요약에 반영한다. (이미 종료된 세션을 다시 종료해도 중복 집계되지 않음)
+            before = _summary_values(row.start_time, row.end_time, row.avg_focus)
+            after = _summary_values(row.start_time, session.end_time, session.avg_focus)
 
-        return StudySession(**row_to_dict(new_session))
+            await db.execute(update(Session_db).where(*where).values(**values))
+            await self._add_daily_summary(
+                db,
+                user_id,
+                _session_date(row.created_at),
+                0,
+                tuple(new - old for new, old in zip(after, before)),
+            )
+            await commit(db)
+
+        return StudySession(**row_to_dict({**row._mapping, **values}))
             
+    # 샘플 행은 생성 시 받은 id 그대로 저장되므로 id로 비교한다.
+    def sample_key(self, data: StudyData):
+        return data.id
+
     # StudyData 집중도 데이터 생성 (bulk insert)
-    async def save_data(self, user_id:str, datas: list[StudyData]) -> list[StudyData]:
-        async with AsyncSessionLocal() as db:
-            new_datas = [
-                Data_db(   
-                    id = data.id,
-                    session_id = data.session_id,
-                    ppg_value = data.ppg_value,
-                    focus_score = data.focus_score,
-                    time = data.time,
-                    created_at = data.created_at
-                )
-                for data in datas
-            ]
-            db.add_all(new_datas)
-            await db.commit()
+    # ORM 객체를 만들지 않고 Core INSERT를 chunk_size 단위의 executemany(다중 VALUES)로 실행한다.
+    # ignore_duplicates이면 INSERT IGNORE로 이미 있는 id(또는 삭제된 세션)의 행을 건너뛴다.
+    async def save_data(self, user_id:str, datas: list[StudyData], ignore_duplicates: bool = False) -> list[StudyData]:
+        if not datas:
+            return datas
+
+        rows = [
+            {
+                "id": data.id,
+                "session_id": data.session_id,
+                "ppg_value": data.ppg_value,
+                "focus_score": data.focus_score,
+                "time": data.time,
+                "created_at": data.created_at,
+            }
+            for data in datas
+        ]
+        await self._insert_data_rows(rows, ignore_duplicates)
 
         return datas
 
+    # 열 단위 샘플을 dict 행으로 한 번만 만들어 INSERT 파라미터와 반환값으로 같이 쓴다.
+    async def save_data_columns(self, user_id:str, columns: StudyDataColumns, ignore_duplicates: bool = False) -> list[dict]:
+        rows = columns.rows()
+        if rows:
+            await self._insert_data_rows(rows, ignore_duplicates)
+
+        return rows
+
+    # 오프라인 학습 업로드: 세션과 전체 샘플을 한 트랜잭션으로 저장한다.
+    async def save_session_archive(self, user_id:str, session: StudySession, columns: StudyDataColumns) -> StudySession:
+        async with get_db_session() as db:
+            try:
+                db.add(Session_db(
+                    id = session.id,
+                    user_id = user_id,
+                    subject_id = session.subject_id,
+                    subject = session.subject,
+                    avg_focus = session.avg_focus,
+                    ai_avg_focus = session.ai_avg_focus,
+                    start_time = session.start_time,
+                    end_time = session.end_time,
+                    created_at = session.created_at,
+                    updated_at = session.updated_at,
+                ))
+                await db.flush()
+                await self._execute_data_columns(db, columns)
+                await self._add_daily_summary(
+                    db,
+                    user_id,
+                    _session_date(session.created_at),
+                    1,
+                    _summary_values(session.start_time, session.end_time, session.avg_focus),
+                )
+                await commit(db)
+            except IntegrityError:
+                await db.rollback()
+                raise HTTPException(status_code = 409)
+
+        return session
+
+    async def _execute_data_columns(self, db, columns: StudyDataColumns):
+        await self._execute_data_rows(db, columns.rows())
+
+    async def _execute_data_rows(self, db, rows: list[dict], ignore_duplicates: bool = False):
+        statement = insert(Data_db.__table__)
+        if ignore_duplicates or self.unique_time:
+            statement = statement.prefix_with("IGNORE")
+
+        for start in range(0, len(rows), self.chunk_size):
+            await db.execute(statement, rows[start:start + self.chunk_size])
+
+    async def _insert_data_rows(self, rows: list[dict], ignore_duplicates: bool = False):
+        async with get_db_session() as db:
+            await self._execute_data_rows(db, rows, ignore_duplicates)
+            await commit(db)
+
     # 학습 세션 삭제
+    # 샘플은 FK(ON DELETE CASCADE)로 DB가 지우므로 ORM으로 세션/샘플을 읽지 않고 DELETE 한 번으로 삭제한다.
+    # 날짜별 요약에서 뺄 값은 DELETE ... RETURNING으로 받고, 지원하지 않는 DB(MySQL)는 필요한 컬럼만 잠가 읽는다.
     async def delete_session(self, user_id:str, session_id: str):
-        async with AsyncSessionLocal() as db:
-            query = select(Session_db).where(Session_db.user_id == user_id, Session_db.id == session_id)
-            result = await db.execute(query)
-            session = result.scalars().first()
+        where = [Session_db.user_id == user_id, Session_db.id == session_id]
+        columns = [Session_db.created_at, Session_db.start_time, Session_db.end_time, Session_db.avg_focus]
+        statement = delete(Session_db).where(*where)
+
+        async with get_db_session() as db:
+            if db.get_bind().dialect.delete_returning:
+                result = await db.execute(statement.returning(*columns))
+                session = result.first()
+            else:
+                result = await db.execute(select(*columns).where(*where).with_for_update())
+                session = result.first()
+                if session:
+                    await db.execute(statement)
 
             if not session:
                 raise HTTPException(status_code = 422)
 
-            await db.delete(session)
-            await db.commit()
+            await self._add_daily_summary(
+                db,
+                user_id,
+                _session_date(session.created_at),
+                -1,
+                tuple(-value for value in _summary_values(session.start_time, session.end_time, session.avg_focus)),
+            )
+            await commit(db)
     
      # 과목 조회
     async def get_subjects(self, user_id:str) -> list[Subject]:
-        async with AsyncSessionLocal() as db:
+        async with get_db_session() as db:
             query = select(SubjectDB).where(SubjectDB.user_id == user_id)
             result = await db.execute(query)
             subjects = result.scalars().all()
@@ -176,7 +600,7 @@ class StudyRepository(IStudy):
         
     # 과목 추가
     async def save_subject(self, user_id:str, subject: Subject) -> Subject:
-        async with AsyncSessionLocal() as db:
+        async with get_db_session() as db:
             new_subject = SubjectDB(
                 id = subject.id,
                 user_id = subject.user_id,
@@ -184,47 +608,46 @@ class StudyRepository(IStudy):
                 created_at = subject.created_at,
             )
             db.add(new_subject)
-            await db.commit()
+            await commit(db)
             await db.refresh(new_subject)
 
         return Subject(**row_to_dict(new_subject))
 
     # 과목 수정
     async def update_subject(self, user_id:str, subject: Subject) -> Subject:
-        async with AsyncSessionLocal() as db:
-            query = select(SubjectDB).where(SubjectDB.user_id == user_id, SubjectDB.id == subject.id)
-            result = await db.execute(query)
-            new_subject = result.scalars().first()
+        async with get_db_session() as db:
+            new_subject = await update_returning(
+                db,
+                SubjectDB,
+                [SubjectDB.user_id == user_id, SubjectDB.id == subject.id],
+                {"subject_name": subject.subject_name},
+            )
 
             if not new_subject:
                 raise HTTPException(status_code = 422)
-            
-            new_subject.subject_name = subject.subject_name
-            await db.commit()
+
+            await commit(db)
 
         return Subject(**row_to_dict(new_subject))
 
-    # 과목 삭제
+    # 과목 삭제 (이 과목의 세션은 FK(ON DELETE SET NULL)로 DB가 subject_id를 비운다)
     async def delete_subject(self, user_id:str, subject: Subject):
-        async with AsyncSessionLocal() as db:
-            query = select(SubjectDB).where(SubjectDB.user_id == user_id, SubjectDB.id == subject.id)
+        async with get_db_session() as db:
+            query = delete(SubjectDB).where(SubjectDB.user_id == user_id, SubjectDB.id == subject.id)
             result = await db.execute(query)
-            subject = result.scalars().first()
 
-            if not subject:
+            if not result.rowcount:
                 raise HTTPException(status_code = 422)
 
-            await db.delete(subject)
-            await db.commit()
+            await commit(db)
 
     # 과목명으로 과목 조회
     async def find_by_subject_name(self, user_id:str, subject_name:str) -> Subject:
-        async with AsyncSessionLocal() as db:
-            query = select(SubjectDB).where(SubjectDB.user_id == user_id, SubjectDB.subject_name == subject_name)
-            result = await db.execute(query)
-            subject = result.scalars().first()
+        async with get_db_session() as db:
+            result = await db.execute(self.statements.subject_by_name, {"user_id": user_id, "subject_name": subject_name})
+            subject = result.first()
 
             if not subject:
                 raise HTTPException(status_code = 422)
         
-        return Subject(**row_to_dict(subject))
+        return self.statements.subject_mapper.one(subject)
@@ -0,0 +1,42 @@
+import redis.asyncio as redis
+from common.cache import LRUCache
+
+SESSION_OPEN = "open"
+SESSION_CLOSED = "closed"
+
+# (user_id, session_id) -> 세션 상태(open/closed) 캐시
+# 워커 내 LRU를 먼저 보고, 없으면 Redis를 본다. 둘 다 없으면 호출한 쪽에서 DB를 조회해 채운다.
+# 다른 워커의 LRU는 local_ttl 동안 이전 상태를 볼 수 있으므로 local_ttl은 짧게 둔다.
+SESSION_KEY = "study:session:{user_id}:{session_id}"
+
+
+class SessionOwnershipCache:
+    def __init__(self, redis: redis.Redis, ttl: int = 3600, local_ttl: float = 30, maxsize: int = 10000):
+        self.redis = redis
+        self.ttl = ttl
+        self.local = LRUCache(maxsize = maxsize, ttl = local_ttl)
+
+    @staticmethod
+    def _key(user_id: str, session_id: str) -> str:
+        return SESSION_KEY.format(user_id=user_id, session_id=session_id)
+
+    async def get(self, user_id: str, session_id: str) -> str | None:
+        state = self.local.get((user_id, session_id))
+        if state is not None:
+            return state
+
+        state = await self.redis.get(self._key(user_id, session_id))
+        if state is None:
+            return None
+
+        state = state.decode("utf-8") if isinstance(state, bytes) else state
+        self.local.set((user_id, session_id), state)
+        return state
+
+    async def set(self, user_id: str, session_id: str, state: str):
+        self.local.set((user_id, session_id), state)
+        await self.redis.set(self._key(user_id, session_id), state, ex=self.ttl)
+
+    async def delete(self, user_id: str, session_id: str):
+        self.local.delete((user_id, session_id))
+        await self.redis.delete(self._key(user_id, session_id))
@@ -0,0 +1,42 @@
+from typing import Awaitable, Callable
+import redis.asyncio as redis
+
+# 유저별 학습 세션 수 캐시 (페이지 조회의 total_count)
+# 세션 생성/삭제 시 INCRBY로 갱신하고, 키가 없으면 DB에서 센 값으로 채운다.
+# 채우는 동안 생성/삭제가 겹치면 어긋날 수 있으므로 TTL이 지나면 키를 버리고 DB에서 다시 센다. (주기적 보정)
+SESSION_COUNT_KEY = "study:session_count:{user_id}"
+
+# 키가 있을 때만 증감한다. (없는 키를 1로 만들면 실제 개수와 달라짐, INCRBY는 TTL을 유지)
+INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+class SessionCounter:
+    def __init__(self, redis: redis.Redis, ttl: int = 3600):
+        self.redis = redis
+        self.ttl = ttl
+        self._incr = redis.register_script(INCR_IF_EXISTS)
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return SESSION_COUNT_KEY.format(user_id=user_id)
+
+    async def get(self, user_id: str, load: Callable[[], Awaitable[int]]) -> int:
+        count = await self.redis.get(self._key(user_id))
+        if count is not None:
+            return int(count)
+
+        count = await load()
+        # 그사이 다른 요청이 채웠거나 증감했다면 그 값을 그대로 둔다.
+        await self.redis.set(self._key(user_id), count, ex=self.ttl, nx=True)
+        return count
+
+    async def incr(self, user_id: str, amount: int = 1):
+        await self._incr(keys=[self._key(user_id)], args=[amount])
+
+    async def delete(self, user_id: str):
+        await self.redis.delete(self._key(user_id))
@@ -0,0 +1,61 @@
+import redis.asyncio as redis
+
+# 오프라인 학습 업로드 작업 저장소
+# study:upload:{job_id} 해시 하나에 원본(압축된) 아카이브와 처리 상태를 함께 둔다.
+# - state: pending -> processing -> done | failed
+# 처리가 끝나면 아카이브는 지우고 상태만 TTL 동안 남긴다.
+UPLOAD_KEY = "study:upload:{job_id}"
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+
+def _decode(value: bytes | str | None) -> str | None:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class SessionUploadStore:
+    def __init__(self, redis: redis.Redis, ttl: int = 86400):
+        self.redis = redis
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return UPLOAD_KEY.format(job_id=job_id)
+
+    async def save(self, job_id: str, user_id: str, archive: bytes):
+        key = self._key(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"user_id": user_id, "archive": archive, "state": PENDING})
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def load(self, job_id: str) -> tuple[str, bytes] | None:
+        user_id, archive = await self.redis.hmget(self._key(job_id), ["user_id", "archive"])
+        if user_id is None or archive is None:
+            return None
+        return _decode(user_id), archive
+
+    async def set_state(self, job_id: str, state: str, **fields):
+        key = self._key(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"state": state, **{name: str(value) for name, value in fields.items()}})
+            if state in (DONE, FAILED):
+                pipe.hdel(key, "archive")
+            await pipe.execute()
+
+    # 작업 상태 (다른 유저의 작업이면 None)
+    async def get_status(self, user_id: str, job_id: str) -> dict | None:
+        values = await self.redis.hmget(self._key(job_id), ["user_id", "state", "session_id", "count", "error"])
+        owner_id, state, session_id, count, error = map(_decode, values)
+        if owner_id != user_id:
+            return None
+
+        return {
+            "job_id": job_id,
+            "state": state,
+            "session_id": session_id,
+            "count": int(count) if count is not None else None,
+            "error": error,
+        }
@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel, Field
+import asyncio
+import hashlib
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, WebSocketException, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from dependency_injector.wiring import inject, Provide
-from datetime import datetime
-from typing import Annotated
+from datetime import date, datetime
+from typing import Annotated, AsyncIterator
 from dataclasses import asdict
 
-from common.auth import CurrentUser, get_current_user
+from common.auth import CurrentUser, get_current_user, get_current_user_ws
+from common.logger import logger
+from common.responses import FastJSONResponse
+from config import get_settings
 from containers import Container
+from database import commit_unit_of_work
+from study.application.data_batcher import DataBatcher
 from study.application.study_service import StudyService
+from study.domain.study import StudyData
+from study.infra.idempotency import DONE, IdempotencyStore
+from study.interface.data_formats import COLUMNS_BINARY, COLUMNS_JSON, UPLOAD_PARSERS
+from study.interface.response_formats import encode_datas, negotiate_format
+
+settings = get_settings()
 
 
 router = APIRouter(prefix="/study")
@@ -72,6 +88,69 @@ async def complete_session(
     response = asdict(session)
     return response
 
+# 오프라인 학습 업로드 작업 응답 모델
+class UploadJobResponse(BaseModel):
+    job_id: str
+    state: str
+    session_id: str | None = None
+    count: int | None = None
+    error: str | None = None
+
+# 본문 전체를 메모리에 올리기 전에 크기를 확인한다.
+# Content-Length가 한도를 넘으면 바로 413, 없거나(chunked) 맞지 않아도 읽은 바이트가 한도를 넘는 순간 413
+async def read_body_limited(request: Request, limit: int) -> bytes:
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise HTTPException(status_code = 413)
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise HTTPException(status_code = 413)
+    return bytes(body)
+
+# POST /study/session/upload : 오프라인 학습 세션 일괄 업로드
+# 세션 정보와 전체 샘플을 담은 아카이브(gzip JSON, study.interface.data_formats 참고)를 받아
+# 백그라운드(Celery)에서 저장하고 작업 id를 바로 돌려준다.
+@router.post(
+    "/session/upload",
+    status_code = 202,
+    response_model = UploadJobResponse,
+    openapi_extra = {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/gzip": {"schema": {"type": "string", "format": "binary"}},
+                "application/json": {"schema": {"type": "object"}},
+            },
+        }
+    },
+)
+@inject
+async def upload_session(
+    request: Request,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    study_service: StudyService = Depends(Provide[Container.study_service])
+):
+    archive = await read_body_limited(request, settings.max_archive_size)
+    if not archive:
+        raise HTTPException(status_code = 400, detail = "Empty archive")
+
+    job_id = await study_service.enqueue_session_upload(user_id = current_user.id, archive = archive)
+
+    return {"job_id": job_id, "state": "pending"}
+
+# GET /study/session/upload/{job_id} : 오프라인 학습 업로드 작업 상태 조회
+@router.get("/session/upload/{job_id}", response_model = UploadJobResponse)
+@inject
+async def get_upload_status(
+    job_id: str,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    study_service: StudyService = Depends(Provide[Container.study_service])
+):
+    return await study_service.get_upload_status(user_id = current_user.id, job_id = job_id)
+
 # 데이터 파이단틱 응답 모델
 class DataResponse(BaseModel):
     id: str
@@ -92,14 +171,81 @@ class CreateDataResponse(BaseModel):
     session_id: str = Field(min_length = 1, max_length = 36)
     datas: list[SingleData] = Field(..., min_items=1)
 
+# POST /study/data 가 받는 요청 본문 형식 (Content-Type으로 구분, study.interface.data_formats 참고)
+CREATE_DATA_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "object"},
+                "example": {"session_id": "string", "datas": [{"ppg_value": 0, "focus_score": 0, "time": "2025-01-01T00:00:00+09:00"}]},
+            },
+            COLUMNS_JSON: {
+                "schema": {"type": "object"},
+                "example": {"session_id": "string", "times": [1735657200000, 1735657200040], "ppg": [0, 0], "focus": [0, 0]},
+            },
+            COLUMNS_BINARY: {"schema": {"type": "string", "format": "binary"}},
+        },
+    }
+}
+
 # POST /study/data (집중도 데이터 저장)
-@router.post("/data", status_code = 201, response_model = list[DataResponse])
+# Idempotency-Key 헤더가 있으면 같은 키로 재전송된 묶음은 저장하지 않고 200과 빈 리스트로 응답한다.
+@router.post("/data", status_code = 201, response_model = list[DataResponse], openapi_extra = CREATE_DATA_BODY)
 @inject
 async def create_data(
+    request: Request,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    body : CreateDataResponse,
-    study_service: StudyService = Depends(Provide[Container.study_service])
+    idempotency_key: Annotated[str | None, Header(alias = "Idempotency-Key", min_length = 1, max_length = 64)] = None,
+    study_service: StudyService = Depends(Provide[Container.study_service]),
+    idempotency: IdempotencyStore = Depends(Provide[Container.idempotency_store])
 ):
+    if not idempotency_key:
+        return await save_upload(request, current_user, study_service)
+
+    state = await idempotency.claim(current_user.id, idempotency_key)
+    if state == DONE:
+        return JSONResponse(status_code = 200, content = [], headers = {"Idempotent-Replayed": "true"})
+    if state is not None:
+        raise HTTPException(status_code = 409, detail = "A batch with this Idempotency-Key is being processed")
+
+    # 완료 표시 전에 요청 단위 작업을 커밋해서, 커밋에 실패하면 키를 풀고 재전송을 다시 받는다.
+    try:
+        created_datas = await save_upload(request, current_user, study_service)
+        await commit_unit_of_work()
+    except Exception:
+        await idempotency.release(current_user.id, idempotency_key)
+        raise
+
+    await idempotency.complete(current_user.id, idempotency_key)
+    return created_datas
+
+# 요청 본문 형식에 맞게 파싱해서 저장
+async def save_upload(request: Request, current_user: CurrentUser, study_service: StudyService):
+    content_type = request.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    raw_body = await request.body()
+
+    # 열 단위 JSON / 바이너리 형식은 샘플별 모델 없이 배열 단위로 검증한다.
+    parse = UPLOAD_PARSERS.get(content_type)
+    if parse:
+        try:
+            upload = parse(raw_body, settings.max_upload_samples)
+        except ValueError as e:
+            raise HTTPException(status_code = 400, detail = str(e))
+
+        return await study_service.create_data_columns(
+            user_id = current_user.id,
+            session_id = upload.session_id,
+            times = upload.times,
+            ppg_values = upload.ppg_values,
+            focus_scores = upload.focus_scores,
+        )
+
+    try:
+        body = CreateDataResponse.model_validate_json(raw_body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url = False))
+
     created_datas = await study_service.create_data(
         session_id = body.session_id,
         user_id = current_user.id,
@@ -108,26 +254,127 @@ async def create_data(
 
     return created_datas
 
+# 웹소켓 메시지(샘플 리스트) 검증용 어댑터
+single_datas_adapter = TypeAdapter(list[SingleData])
+
+# WS /study/data/ws?session_id=...&token=... : 실시간 집중도 데이터 수집
+# 연결 시 인증과 세션 확인을 한 번만 수행하고, 받은 샘플은 크기/시간 기준으로 모아서 저장한다.
+# 메시지 형식: {"datas": [{"ppg_value": ..., "focus_score": ..., "time": ...}, ...]}
+@router.websocket("/data/ws")
+@inject
+async def create_data_ws(
+    websocket: WebSocket,
+    session_id: str,
+    current_user: Annotated[CurrentUser, Depends(get_current_user_ws)],
+    study_service: StudyService = Depends(Provide[Container.study_service])
+):
+    try:
+        await study_service.check_session(user_id = current_user.id, session_id = session_id)
+    except HTTPException:
+        raise WebSocketException(code = status.WS_1008_POLICY_VIOLATION)
+
+    await websocket.accept()
+
+    async def save(datas):
+        return await study_service.append_datas(
+            user_id = current_user.id,
+            session_id = session_id,
+            datas = datas
+        )
+
+    batcher = DataBatcher(
+        save,
+        max_size = settings.ws_batch_size,
+        max_delay = settings.ws_batch_interval
+    )
+
+    # 저장에 실패해도 연결은 유지하고 결과를 클라이언트에 알린다.
+    # 요청 문제(4xx: 세션 없음, 중복 등)는 다시 저장해도 같으므로 버리고, 그 외(DB 오류 등)는 버퍼에 남겨 다음에 다시 저장한다.
+    async def flush():
+        try:
+            await websocket.send_json({"saved": await batcher.flush()})
+        except HTTPException as e:
+            if e.status_code >= 500:
+                await websocket.send_json({"error": e.detail, "pending": len(batcher)})
+            else:
+                await websocket.send_json({"error": e.detail, "dropped": batcher.clear()})
+        except Exception:
+            logger.exception("websocket data save failed")
+            await websocket.send_json({"error": "save failed", "pending": len(batcher)})
+
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive(), timeout = batcher.timeout())
+            except asyncio.TimeoutError:
+                # 최대 대기 시간이 지나면 모인 만큼 저장
+                await flush()
+                continue
+
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+            if message.get("text") is None:
+                # 바이너리 프레임은 받지 않는다. 모인 샘플은 저장하고 연결을 닫는다.
+                await flush()
+                await websocket.close(code = status.WS_1003_UNSUPPORTED_DATA)
+                return
+
+            try:
+                message = json.loads(message["text"])
+                datas = single_datas_adapter.validate_python(
+                    message.get("datas") if isinstance(message, dict) else message
+                )
+            except ValueError:
+                await websocket.send_json({"error": "invalid datas"})
+                continue
+
+            batcher.add(datas)
+            if batcher.is_full():
+                await flush()
+    except WebSocketDisconnect:
+        # 연결이 끊기면 남은 샘플을 저장 (결과를 보낼 곳이 없으므로 실패는 기록만 한다)
+        try:
+            await batcher.flush()
+        except Exception:
+            logger.exception("websocket data save failed after disconnect")
+
 # 세션 get 요청 응답 파이단틱 모델
+# 커서 방식에서는 page가 없고, 전체 개수를 세지 않으면 total_count도 없다.
 class GetSessionResponse(BaseModel):
-    total_count: int
-    page: int
+    total_count: int | None
+    page: int | None
     sessions: list[SessionResponse]
+    next_cursor: str | None = None
 
 # GET /study/session : 전체 세션 조회
+# cursor를 보내면 커서 방식(처음은 빈 값 cursor=), 없으면 page/offset 방식으로 조회한다.
 @router.get("/session", response_model = GetSessionResponse)
 @inject
 async def get_sessions(
-    page: int = 1,
-    items_per_page: int = 10,
+    page: int = Query(1, ge=1),
+    items_per_page: int = Query(10, ge=1),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    include_total: bool | None = Query(None, description="전체 개수 조회 여부 (기본: page 방식은 true, 커서 방식은 false)"),
     current_user: CurrentUser = Depends(get_current_user),
     study_service: StudyService = Depends(Provide[Container.study_service])
 ):
-    total_count, sessions = await study_service.get_sessions(
+    total_count, sessions, next_cursor = await study_service.get_sessions(
         user_id = current_user.id,
         page = page,
         items_per_page = items_per_page,
+        cursor = cursor,
+        include_total = include_total,
     )
+    if cursor is not None:
+        page = None
+
+    if settings.trusted_output:
+        return FastJSONResponse({
+            "total_count": total_count,
+            "page": page,
+            "sessions": sessions,
+            "next_cursor": next_cursor,
+        })
 
     res_sessions = []
     for session in sessions:
@@ -138,6 +385,7 @@ async def get_sessions(
         "total_count" : total_count,
         "page" : page,
         "sessions" : res_sessions,
+        "next_cursor" : next_cursor,
     }
 
 class GetSessionDatesResponse(BaseModel):
@@ -156,6 +404,33 @@ async def get_session_dates(
         return {"total_count": 0, "dates": []}
     
     return {"total_count": total_count, "dates": dates}
+
+
+class DailySummaryResponse(BaseModel):
+    date: str
+    session_count: int
+    total_duration: int
+    avg_focus: float | None
+
+class GetDailySummaryResponse(BaseModel):
+    summaries: list[DailySummaryResponse]
+
+# GET /study/summary : 날짜별 학습 요약 (start/end는 YYYY-MM-DD, 둘 다 포함)
+@router.get("/summary", response_model=GetDailySummaryResponse)
+@inject
+async def get_daily_summaries(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    start: date | None = None,
+    end: date | None = None,
+    study_service: StudyService = Depends(Provide[Container.study_service])
+):
+    summaries = await study_service.get_daily_summaries(
+        user_id = current_user.id,
+        start_date = start,
+        end_date = end,
+    )
+
+    return {"summaries": [asdict(summary) for summary in summaries]}
     
     
 class GetSessionResponseByDate(BaseModel):
@@ -176,6 +451,9 @@ async def get_sessions_by_date(
     
     if not sessions:
         return {"total_count": 0, "sessions": []}
+
+    if settings.trusted_output:
+        return FastJSONResponse({"total_count": total_count, "sessions": sessions})
     
     res_session = []
     for session in sessions:
@@ -188,19 +466,117 @@ async def get_sessions_by_date(
 class GetDataResponse(BaseModel):
     datas: list[DataResponse]
 
+NDJSON = "application/x-ndjson"
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _data_json(data: StudyData) -> str:
+    return json.dumps(asdict(data), default=_json_default)
+
+# 샘플을 batch_size 개씩 모아서 한 청크로 내보낸다.
+# - NDJSON: 한 줄에 샘플 하나
+# - JSON: 일반 응답과 같은 {"datas": [...]} 모양을 조각내서 전송
+async def _stream_datas(datas: AsyncIterator[StudyData], ndjson: bool, batch_size: int) -> AsyncIterator[str]:
+    def join(lines: list[str], continued: bool) -> str:
+        if ndjson:
+            return "\n".join(lines) + "\n"
+        return ("," if continued else "") + ",".join(lines)
+
+    if not ndjson:
+        yield '{"datas":['
+
+    lines = []
+    continued = False
+    async for data in datas:
+        lines.append(_data_json(data))
+        if len(lines) >= batch_size:
+            yield join(lines, continued)
+            continued = True
+            lines = []
+    if lines:
+        yield join(lines, continued)
+
+    if not ndjson:
+        yield "]}"
+
+# 강한 ETag: 데이터 버전(세션 id + updated_at + 샘플 수)과 응답 형태(쿼리, 형식)로 만든다.
+def _data_etag(version: str, variant: str) -> str:
+    return '"' + hashlib.sha256(f"{version}|{variant}".encode("utf-8")).hexdigest()[:32] + '"'
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
 # GET /study/data/{session_id} : 특정 세션의 전체 데이터 조회
+# stream=true 이면 서버 측 커서로 읽으면서 바로 내보낸다. (Accept: application/x-ndjson 이면 NDJSON)
+# Accept가 MessagePack/Arrow IPC이면 응답 모델 검증 없이 열 단위 바이너리로 응답한다.
+# 종료된 세션은 ETag/Cache-Control을 붙이고, If-None-Match가 같으면 샘플을 읽지 않고 304로 응답한다.
 @router.get("/data/{session_id}", response_model=GetDataResponse)
 @inject
 async def get_datas(
     session_id: str,
+    response: Response,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    max_points: int | None = Query(None, ge=2, description="구간별 최솟값/최댓값만 남겨 최대 max_points 개로 축소"),
+    bucket: int | None = Query(None, ge=1, description="초 단위 구간별 평균으로 집계"),
+    stream: bool = Query(False, description="전체 데이터를 모으지 않고 스트리밍으로 응답"),
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
     study_service: StudyService = Depends(Provide[Container.study_service])
 ):
+    binary_format = negotiate_format(accept)
+    ndjson = stream and NDJSON in (accept or "")
+
+    if stream:
+        if max_points is not None or bucket is not None:
+            raise HTTPException(status_code=400, detail="stream cannot be combined with max_points or bucket")
+        if binary_format is not None:
+            raise HTTPException(status_code=400, detail="stream supports only JSON and NDJSON")
+
+    cache_headers = {"Vary": "Accept"}
+    version = await study_service.get_data_version(user_id = current_user.id, session_id = session_id)
+    if version is not None:
+        media_type = binary_format or (NDJSON if ndjson else "application/json")
+        variant = f"{media_type}:{max_points}:{bucket}:{stream}:{settings.trusted_output}"
+        cache_headers["ETag"] = _data_etag(version, variant)
+        cache_headers["Cache-Control"] = f"private, max-age={settings.session_data_max_age}"
+        if _etag_matches(if_none_match, cache_headers["ETag"]):
+            return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+
+    if stream:
+        datas = study_service.stream_datas(
+            user_id = current_user.id,
+            session_id = session_id,
+            batch_size = settings.stream_batch_size,
+        )
+        return StreamingResponse(
+            _stream_datas(datas, ndjson, settings.stream_batch_size),
+            media_type = NDJSON if ndjson else "application/json",
+            headers = cache_headers,
+        )
+
     datas = await study_service.get_datas(
         user_id = current_user.id,
         session_id = session_id,
+        max_points = max_points,
+        bucket = bucket,
     )
 
+    if binary_format is not None:
+        binary_response = encode_datas(binary_format, session_id, datas)
+        binary_response.headers.update(cache_headers)
+        return binary_response
+
+    if settings.trusted_output:
+        return FastJSONResponse({"datas": datas}, headers=cache_headers)
+
     if not datas:
         return {"datas": []}
 
@@ -213,6 +589,47 @@ async def get_datas(
         "datas": res_data
     }
 
+# 여러 세션 데이터 조회 요청/응답 파이단틱 모델
+class GetDatasBatchBody(BaseModel):
+    session_ids: list[str] = Field(min_length=1, max_length=settings.max_batch_sessions)
+    max_points: int | None = Field(None, ge=2)
+
+class SessionDatasResponse(BaseModel):
+    session_id: str
+    datas: list[DataResponse]
+
+class GetDatasBatchResponse(BaseModel):
+    sessions: list[SessionDatasResponse]
+
+# POST /study/data/batch : 여러 세션의 데이터를 한 번에 조회 (세션별로 묶어서 응답)
+@router.post("/data/batch", response_model=GetDatasBatchResponse)
+@inject
+async def get_datas_batch(
+    body: GetDatasBatchBody,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    study_service: StudyService = Depends(Provide[Container.study_service])
+):
+    datas_by_session = await study_service.get_datas_batch(
+        user_id = current_user.id,
+        session_ids = body.session_ids,
+        max_points = body.max_points,
+    )
+
+    if settings.trusted_output:
+        return FastJSONResponse({
+            "sessions": [
+                {"session_id": session_id, "datas": datas}
+                for session_id, datas in datas_by_session.items()
+            ]
+        })
+
+    return {
+        "sessions": [
+            {"session_id": session_id, "datas": [asdict(data) for data in datas]}
+            for session_id, datas in datas_by_session.items()
+        ]
+    }
+
 # DELETE /study/session/{session_id} : 특정 학습 세션 삭제
 @router.delete("/session/{session_id}", status_code=204)
 @inject
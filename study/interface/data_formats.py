@@ -0,0 +1,222 @@
+import json
+import math
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+from datetime import datetime
+from typing import NamedTuple
+import pytz
+
+korea_timezone = pytz.timezone('Asia/Seoul')
+
+# POST /study/data 가 받는 압축 업로드 형식 (Content-Type으로 구분)
+#
+# 1. 열 단위 JSON (application/vnd.study.columns+json)
+#    {"session_id": "...", "times": [epoch ms, ...], "ppg": [...], "focus": [...]}
+#
+# 2. 바이너리 (application/vnd.study.columns+binary), little-endian
+#    uint8 session_id 길이 | session_id (utf-8) | int64 첫 샘플 시간(epoch ms) | uint32 샘플 수(n)
+#    | uint32 시간 delta(ms, 바로 앞 샘플과의 차이)[n] | float32 ppg[n] | float32 focus[n]
+#    첫 샘플의 delta는 0이다.
+#
+# 3. 오프라인 학습 아카이브 (POST /study/session/upload, gzip 압축 또는 그대로의 JSON)
+#    {"subject": "...", "start_time": "...", "end_time": "...", "avg_focus": 0.0, "ai_avg_focus": 0.0,
+#     "times": [epoch ms, ...], "ppg": [...], "focus": [...]}
+#
+# 샘플마다 모델을 만들지 않고 배열 단위(array, min/max, map)로 한 번에 검증한다.
+COLUMNS_JSON = "application/vnd.study.columns+json"
+COLUMNS_BINARY = "application/vnd.study.columns+binary"
+GZIP_MAGIC = b"\x1f\x8b"
+
+_BINARY_HEADER = struct.Struct("<qI")
+
+
+class UploadColumns(NamedTuple):
+    session_id: str
+    times: list[datetime]
+    ppg_values: list[float]
+    focus_scores: list[float]
+
+
+class SessionArchive(NamedTuple):
+    subject: str
+    start_time: str
+    end_time: str
+    avg_focus: float | None
+    ai_avg_focus: float | None
+    times: list[datetime]
+    ppg_values: list[float]
+    focus_scores: list[float]
+
+
+def _check_session_id(session_id) -> str:
+    if not isinstance(session_id, str) or not 1 <= len(session_id) <= 36:
+        raise ValueError("session_id must be a string of 1 to 36 characters")
+    return session_id
+
+
+def _check_count(count: int, max_samples: int):
+    if not 1 <= count <= max_samples:
+        raise ValueError(f"sample count must be between 1 and {max_samples}")
+
+
+def _check_finite(name: str, values: array):
+    if not all(map(math.isfinite, values)):
+        raise ValueError(f"{name} must contain only finite numbers")
+
+
+def _to_times(epoch_ms) -> list[datetime]:
+    # 기존 업로드와 같이 한국 시간 기준으로 저장되도록 변환한다.
+    # datetime 범위를 벗어난 값(예: 1e20)은 OverflowError/OSError가 나므로 422가 되도록 ValueError로 바꾼다.
+    try:
+        return [datetime.fromtimestamp(ms / 1000, korea_timezone) for ms in epoch_ms]
+    except (OverflowError, OSError, ValueError):
+        raise ValueError("times must be epoch milliseconds within the datetime range")
+
+
+def _load_json_object(body: bytes) -> dict:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValueError("body is not valid JSON")
+    if not isinstance(payload, dict):
+        raise ValueError("body must be a JSON object")
+    return payload
+
+
+def _check_text(payload: dict, name: str, max_length: int) -> str:
+    value = payload.get(name)
+    if not isinstance(value, str) or not 1 <= len(value) <= max_length:
+        raise ValueError(f"{name} must be a string of 1 to {max_length} characters")
+    return value
+
+
+def _check_optional_number(payload: dict, name: str) -> float | None:
+    value = payload.get(name)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a finite number")
+    try:
+        value = float(value)
+    except OverflowError:   # float로 바꿀 수 없을 만큼 큰 정수
+        raise ValueError(f"{name} must be a finite number")
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite number")
+    return value
+
+
+def parse_columns_json(body: bytes, max_samples: int) -> UploadColumns:
+    payload = _load_json_object(body)
+    session_id = _check_session_id(payload.get("session_id"))
+    times, ppg_values, focus_scores = _parse_column_arrays(payload, max_samples)
+
+    return UploadColumns(
+        session_id = session_id,
+        times = times,
+        ppg_values = ppg_values,
+        focus_scores = focus_scores,
+    )
+
+
+def _parse_column_arrays(payload: dict, max_samples: int) -> tuple[list[datetime], list[float], list[float]]:
+    columns = {}
+    for name in ("times", "ppg", "focus"):
+        values = payload.get(name)
+        if not isinstance(values, list):
+            raise ValueError(f"{name} must be an array")
+        # array("d")는 true/false를 1/0으로 받아들이므로 따로 막는다.
+        if any(isinstance(value, bool) for value in values):
+            raise ValueError(f"{name} must contain only numbers")
+        try:
+            columns[name] = array("d", values)
+        except TypeError:
+            raise ValueError(f"{name} must contain only numbers")
+        except OverflowError:   # float로 바꿀 수 없을 만큼 큰 정수
+            raise ValueError(f"{name} must contain only finite numbers")
+        _check_finite(name, columns[name])
+
+    count = len(columns["times"])
+    if len(columns["ppg"]) != count or len(columns["focus"]) != count:
+        raise ValueError("times, ppg and focus must have the same length")
+    _check_count(count, max_samples)
+    if min(columns["times"]) < 0:
+        raise ValueError("times must be non-negative epoch milliseconds")
+
+    return _to_times(columns["times"]), columns["ppg"].tolist(), columns["focus"].tolist()
+
+
+def parse_columns_binary(body: bytes, max_samples: int) -> UploadColumns:
+    if not body:
+        raise ValueError("body is empty")
+
+    id_length = body[0]
+    offset = 1 + id_length
+    if len(body) < offset + _BINARY_HEADER.size:
+        raise ValueError("body is too short")
+    try:
+        session_id = _check_session_id(body[1:offset].decode("utf-8"))
+    except UnicodeDecodeError:
+        raise ValueError("session_id must be utf-8")
+
+    start_ms, count = _BINARY_HEADER.unpack_from(body, offset)
+    offset += _BINARY_HEADER.size
+    if start_ms < 0:
+        raise ValueError("start time must be non-negative epoch milliseconds")
+    _check_count(count, max_samples)
+    if len(body) != offset + count * 12:
+        raise ValueError(f"body length does not match sample count {count}")
+
+    deltas = array("I", body[offset:offset + count * 4])
+    ppg_values = array("f", body[offset + count * 4:offset + count * 8])
+    focus_scores = array("f", body[offset + count * 8:])
+    if sys.byteorder == "big":
+        for values in (deltas, ppg_values, focus_scores):
+            values.byteswap()
+
+    _check_finite("ppg", ppg_values)
+    _check_finite("focus", focus_scores)
+
+    # delta 누적합으로 절대 시간을 복원한다. (첫 delta는 0)
+    epoch_ms = list(accumulate(deltas, initial=start_ms))[1:]
+
+    return UploadColumns(
+        session_id = session_id,
+        times = _to_times(epoch_ms),
+        ppg_values = ppg_values.tolist(),
+        focus_scores = focus_scores.tolist(),
+    )
+
+
+def parse_session_archive(body: bytes, max_samples: int, max_size: int) -> SessionArchive:
+    # gzip으로 압축된 아카이브는 max_size까지만 풀어본다.
+    if body[:2] == GZIP_MAGIC:
+        decompressor = zlib.decompressobj(wbits=31)
+        try:
+            body = decompressor.decompress(body, max_size + 1)
+        except zlib.error:
+            raise ValueError("archive is not valid gzip")
+        if len(body) > max_size:
+            raise ValueError("decompressed archive is too large")
+
+    payload = _load_json_object(body)
+    times, ppg_values, focus_scores = _parse_column_arrays(payload, max_samples)
+
+    return SessionArchive(
+        subject = _check_text(payload, "subject", 10),
+        start_time = _check_text(payload, "start_time", 30),
+        end_time = _check_text(payload, "end_time", 30),
+        avg_focus = _check_optional_number(payload, "avg_focus"),
+        ai_avg_focus = _check_optional_number(payload, "ai_avg_focus"),
+        times = times,
+        ppg_values = ppg_values,
+        focus_scores = focus_scores,
+    )
+
+
+UPLOAD_PARSERS = {
+    COLUMNS_JSON: parse_columns_json,
+    COLUMNS_BINARY: parse_columns_binary,
+}
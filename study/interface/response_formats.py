@@ -0,0 +1,97 @@
+from datetime import datetime
+from fastapi import Response
+import msgpack
+import pyarrow as pa
+import pytz
+from study.domain.study import StudyData
+
+korea_timezone = pytz.timezone('Asia/Seoul')
+
+# GET /study/data/{session_id} 의 바이너리 응답 형식 (Accept 헤더로 선택)
+# 샘플마다 객체를 만들지 않고 열(column) 단위 배열로 보낸다. 시간은 epoch ms 정수이다.
+#
+# 1. MessagePack (application/msgpack)
+#    {"session_id": "...", "ids": [...], "times": [...], "ppg": [...], "focus": [...]}
+#
+# 2. Arrow IPC stream (application/vnd.apache.arrow.stream)
+#    id: string, time: timestamp[ms, Asia/Seoul], ppg_value: float64, focus_score: float64
+#    session_id는 스키마 메타데이터에 담는다.
+MSGPACK = "application/msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+_MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+
+# Accept 헤더에서 바이너리 형식을 고른다. (해당 없으면 None -> JSON)
+def negotiate_format(accept: str | None) -> str | None:
+    for item in (accept or "").split(","):
+        media_type = item.split(";")[0].strip().lower()
+        if media_type in _MSGPACK_TYPES:
+            return MSGPACK
+        if media_type == ARROW_STREAM:
+            return ARROW_STREAM
+    return None
+
+
+def _epoch_ms(value: datetime | str) -> int:
+    # DB에서 읽은 시간은 ISO 문자열 또는 한국 시간 기준의 naive datetime이다.
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = korea_timezone.localize(value)
+    return round(value.timestamp() * 1000)
+
+
+def _columns(datas: list[StudyData]) -> tuple[list[str], list[int], list[float], list[float]]:
+    return (
+        [data.id for data in datas],
+        [_epoch_ms(data.time) for data in datas],
+        [data.ppg_value for data in datas],
+        [data.focus_score for data in datas],
+    )
+
+
+def to_msgpack(session_id: str, datas: list[StudyData]) -> bytes:
+    ids, times, ppg_values, focus_scores = _columns(datas)
+    return msgpack.packb({
+        "session_id": session_id,
+        "ids": ids,
+        "times": times,
+        "ppg": ppg_values,
+        "focus": focus_scores,
+    })
+
+
+def to_arrow_stream(session_id: str, datas: list[StudyData]) -> bytes:
+    ids, times, ppg_values, focus_scores = _columns(datas)
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("time", pa.timestamp("ms", tz="Asia/Seoul")),
+            ("ppg_value", pa.float64()),
+            ("focus_score", pa.float64()),
+        ],
+        metadata = {"session_id": session_id},
+    )
+    columns = (ids, times, ppg_values, focus_scores)
+    batch = pa.record_batch(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema = schema,
+    )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+_ENCODERS = {
+    MSGPACK: to_msgpack,
+    ARROW_STREAM: to_arrow_stream,
+}
+
+
+# pydantic 응답 모델 검증 없이 바로 인코딩해서 응답한다.
+def encode_datas(media_type: str, session_id: str, datas: list[StudyData]) -> Response:
+    content = _ENCODERS[media_type](session_id, datas)
+    return Response(content=content, media_type=media_type, headers={"Vary": "Accept"})
@@ -0,0 +1,16 @@
+import os
+
+# config.Settings의 필수 값 (테스트는 DB/Redis에 연결하지 않는다)
+for key, value in {
+    "DATABASE_USERNAME": "test",
+    "DATABASE_PASSWORD": "test",
+    "DATABASE_HOST": "localhost",
+    "DATABASE_NAME": "test",
+    "JWT_SECRET": "test",
+    "EMAIL_PASSWORD": "test",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_BACKEND_URL": "cache+memory://",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+}.items():
+    os.environ.setdefault(key, value)
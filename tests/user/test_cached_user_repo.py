@@ -0,0 +1,95 @@
+import asyncio
+import json
+from datetime import datetime
+
+from common.read_cache import ReadCache
+from user.domain.user import User
+from user.infra.repository.cached_user_repo import USER_KEY, CachedUserRepository
+
+
+class FakePubSub:
+    async def subscribe(self, channel: str):
+        pass
+
+    async def listen(self):
+        await asyncio.Event().wait()
+        yield
+
+    async def aclose(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key: str):
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str, ex: int | None = None):
+        self.values[key] = value.encode("utf-8")
+
+    def pubsub(self):
+        return FakePubSub()
+
+
+class FakeUserRepository:
+    def __init__(self, user: User):
+        self.user = user
+        self.calls = 0
+
+    async def find_by_id(self, id: str) -> User:
+        self.calls += 1
+        return self.user
+
+
+def make_user(created_at, updated_at) -> User:
+    return User(
+        id = "USER1",
+        name = "tester",
+        email = "tester@test.com",
+        password = "hashed-password",
+        memo = None,
+        created_at = created_at,
+        updated_at = updated_at,
+    )
+
+
+async def find_twice(user: User):
+    redis = FakeRedis()
+    cache = ReadCache(redis)
+    repo = FakeUserRepository(user)
+    cached_repo = CachedUserRepository(repo, cache)
+    try:
+        missed = await cached_repo.find_by_id("USER1")
+        # 워커 LRU를 비워 두 번째 조회가 Redis에서 읽히게 한다.
+        cache.local.clear()
+        hit = await cached_repo.find_by_id("USER1")
+    finally:
+        await cache.close()
+    return redis, repo, missed, hit
+
+
+def test_find_by_id_miss_then_hit():
+    created_at = datetime(2026, 10, 18, 9, 30, 0, 123456)
+    updated_at = datetime(2026, 10, 18, 10, 0)
+
+    redis, repo, missed, hit = asyncio.run(find_twice(make_user(created_at, updated_at)))
+
+    assert repo.calls == 1
+    assert missed.created_at == hit.created_at == created_at
+    assert missed.updated_at == hit.updated_at == updated_at
+    assert hit.id == missed.id and hit.email == missed.email
+    # 비밀번호 해시는 캐시에 두지 않는다.
+    assert hit.password is None
+    assert "password" not in json.loads(redis.values[USER_KEY.format(user_id="USER1")])
+
+
+def test_find_by_id_accepts_iso_string_times():
+    user = make_user("2026-10-18T09:30:00.123456", "2026-10-18T10:00:00")
+
+    _, repo, _, hit = asyncio.run(find_twice(user))
+
+    assert repo.calls == 1
+    assert hit.created_at == datetime(2026, 10, 18, 9, 30, 0, 123456)
+    assert hit.updated_at == datetime(2026, 10, 18, 10, 0)
@@ -7,6 +7,7 @@ from user.domain.repository.user_repo import IUserRepository
 from user.application.email_service import EmailService
 from user.application.send_welcome_email_task import SendWelcomeEmailTask
 from utils.crypto import Crypto
+from utils.cursor import decode_cursor, encode_cursor
 from dependency_injector.wiring import inject, Provide
 from fastapi import Depends
 from common.auth import Role, create_access_token
@@ -20,8 +21,9 @@ class UserService:
     # 컨테이너에 직접 user_repo 팩토리를 선언해두었기 때문에 타입 선언만으로도 
     # UserService가 생성될 때 팩토리를 수행한 객체가 주입된다.
     @inject
-    def __init__(self, user_repo: IUserRepository, email_service: EmailService, crypto: Crypto, redis: redis.Redis):
+    def __init__(self, user_repo: IUserRepository, email_service: EmailService, crypto: Crypto, redis: redis.Redis, count_window: bool = False):
         self.user_repo = user_repo
+        self.count_window = count_window
         self.ulid = ULID()
         self.crypto = crypto
         self.email_service = email_service
@@ -79,8 +81,38 @@ class UserService:
 
         return user
     
-    async def get_users(self, page: int, items_per_page: int) -> tuple[int, list[User]]:
-        return await self.user_repo.get_users(page, items_per_page)
+    # cursor가 있으면 커서(keyset) 방식, 없으면 기존 page/offset 방식으로 조회한다.
+    # 두 방식 모두 다음 페이지가 있으면 next_cursor를 함께 반환한다.
+    # include_total이 None이면 page 방식은 전체 개수를 세고, 커서 방식은 세지 않는다. (세지 않으면 None)
+    async def get_users(
+        self,
+        page: int = 1,
+        items_per_page: int = 10,
+        cursor: str | None = None,
+        include_total: bool | None = None,
+    ) -> tuple[int | None, list[User], str | None]:
+        if include_total is None:
+            include_total = cursor is None
+
+        if cursor is None:
+            if include_total:
+                total_count, users = await self.user_repo.get_users(page, items_per_page, window = self.count_window)
+                has_more = page * items_per_page < total_count
+            else:
+                # 한 명 더 읽어서 다음 페이지가 있는지 확인한다.
+                users = await self.user_repo.get_users_page((page - 1) * items_per_page, items_per_page + 1)
+                total_count, has_more, users = None, len(users) > items_per_page, users[:items_per_page]
+            next_cursor = encode_cursor(users[-1].id) if users and has_more else None
+            return total_count, users, next_cursor
+
+        # 한 명 더 읽어서 다음 페이지가 있는지 확인한다.
+        users = await self.user_repo.get_users_after(
+            after_id = decode_cursor(cursor) if cursor else None,
+            limit = items_per_page + 1,
+        )
+        next_cursor = encode_cursor(users[items_per_page - 1].id) if len(users) > items_per_page else None
+        total_count = await self.user_repo.count_users() if include_total else None
+        return total_count, users[:items_per_page], next_cursor
 
     async def delete_user(self, user_id: str):
         await self.user_repo.delete(user_id)
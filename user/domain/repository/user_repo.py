@@ -25,8 +25,23 @@ class IUserRepository(metaclass=ABCMeta):
     async def update(self, user: User):
         raise NotImplementedError
     
+    # window이면 전체 개수와 페이지를 쿼리 한 번(윈도 함수)으로 조회
     @abstractmethod
-    async def get_users(self, page: int, items_per_page: int) -> tuple[int, list[User]]:
+    async def get_users(self, page: int, items_per_page: int, window: bool = False) -> tuple[int, list[User]]:
+        raise NotImplementedError
+
+    # 전체 개수 없이 id 순으로 offset부터 최대 limit 명 조회
+    @abstractmethod
+    async def get_users_page(self, offset: int, limit: int) -> list[User]:
+        raise NotImplementedError
+
+    # after_id 다음 유저부터 id 순으로 최대 limit 명 조회 (after_id가 None이면 처음부터)
+    @abstractmethod
+    async def get_users_after(self, after_id: str | None, limit: int) -> list[User]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_users(self) -> int:
         raise NotImplementedError
     
     @abstractmethod
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 # @dataclass(데코레이터)를 이용해 생성자, 함수들을 자동으로 생성
-@dataclass
+@dataclass(slots=True)
 class User:
     id: str
     name: str
@@ -0,0 +1,64 @@
+from dataclasses import asdict
+from datetime import datetime
+from common.read_cache import ReadCache
+from database import after_commit
+from user.domain.repository.user_repo import IUserRepository
+from user.domain.user import User
+
+USER_KEY = "cache:user:{user_id}"
+
+
+# 비밀번호 해시는 Redis에 두지 않는다. (캐시에서 읽은 User의 password는 None, 로그인은 find_by_email로 DB에서 확인)
+# 시간은 ISO 문자열로 저장하고 꺼낼 때 datetime으로 되돌린다. (ISO 문자열을 돌려주는 저장소 구현도 받아들인다)
+def _encode_user(user: User) -> dict:
+    value = asdict(user)
+    del value["password"]
+    for key in ("created_at", "updated_at"):
+        if isinstance(value[key], datetime):
+            value[key] = value[key].isoformat()
+    return value
+
+
+def _decode_user(value: dict) -> User:
+    value["created_at"] = datetime.fromisoformat(value["created_at"])
+    value["updated_at"] = datetime.fromisoformat(value["updated_at"])
+    return User(**value, password=None)
+
+
+class CachedUserRepository:
+    """
+    IUserRepository 구현체를 감싸 find_by_id 결과를 ReadCache에 캐시한다.
+    update / delete는 원래 저장소에 위임한 뒤 해당 유저의 키를 무효화한다. (요청 단위 작업 안에서는 커밋된 뒤에)
+    캐시하지 않는 나머지 메서드는 그대로 원래 저장소로 전달된다.
+    """
+
+    def __init__(self, repo: IUserRepository, cache: ReadCache):
+        self.repo = repo
+        self.cache = cache
+
+    def __getattr__(self, name: str):
+        return getattr(self.repo, name)
+
+    async def find_by_id(self, id: str) -> User:
+        return await self.cache.get_or_load(
+            USER_KEY.format(user_id=id),
+            lambda: self.repo.find_by_id(id),
+            _encode_user,
+            _decode_user,
+        )
+
+    async def update(self, user_vo: User) -> User:
+        try:
+            return await self.repo.update(user_vo)
+        finally:
+            await after_commit(lambda: self.cache.invalidate(USER_KEY.format(user_id=user_vo.id)))
+
+    async def delete(self, id: str):
+        try:
+            await self.repo.delete(id)
+        finally:
+            await after_commit(lambda: self.cache.invalidate(USER_KEY.format(user_id=id)))
+
+
+# 추상 메서드를 모두 위임하므로 IUserRepository 구현체로 등록한다.
+IUserRepository.register(CachedUserRepository)
@@ -1,11 +1,15 @@
 from fastapi import HTTPException
+from sqlalchemy import delete
 from sqlalchemy.future import select
 from sqlalchemy.sql import func
-from database import AsyncSessionLocal
+from database import commit, get_db_session
 from user.domain.repository.user_repo import IUserRepository
 from user.domain.user import User as UserVO
 from user.infra.db_models.user import User
-from utils.db_utils import row_to_dict
+from utils.db_utils import RowMapper, row_to_dict, update_returning
+
+# 유저 목록/단건 조회용 (Core 행 -> User 도메인 객체)
+user_mapper = RowMapper(UserVO, User)
 
 class UserRepository(IUserRepository):
     async def save(self, user: UserVO):
@@ -19,16 +23,16 @@ class UserRepository(IUserRepository):
             updated_at=user.updated_at,
         )
 
-        async with AsyncSessionLocal() as db:
+        async with get_db_session() as db:
             try:
                 db.add(new_user)
-                await db.commit()
+                await commit(db)
             except Exception as e:
                 await db.rollback()
                 raise e
 
     async def find_by_email(self, email: str) -> UserVO:
-        async with AsyncSessionLocal() as db:
+        async with get_db_session() as db:
             query = select(User).where(User.email == email)
             result = await db.execute(query)
             user = result.scalars().first()
@@ -38,58 +42,98 @@ class UserRepository(IUserRepository):
         
         return UserVO(**row_to_dict(user))
     
+    # 목록 조회와 같이 Core 행으로 읽어 created_at/updated_at을 datetime 그대로 돌려준다. (캐시에서 읽은 값과 같은 형태)
     async def find_by_id(self, id: str):
-        async with AsyncSessionLocal() as db:
-            query = select(User).where(User.id == id)
+        async with get_db_session() as db:
+            query = select(*user_mapper.columns).where(User.id == id)
             result = await db.execute(query)
-            user = result.scalars().first()
+            row = result.first()
 
-        if not user:
+        if not row:
             raise HTTPException(status_code=422, detail="User not found")
         
-        return UserVO(**row_to_dict(user))
+        return user_mapper.one(row)
 
     async def update(self, user_vo: UserVO):
-        async with AsyncSessionLocal() as db:
-            query = select(User).where(User.id == user_vo.id)
-            result = await db.execute(query)
-            user = result.scalars().first()
+        # 캐시에서 읽은 유저는 password가 None이므로 이때는 비밀번호를 그대로 둔다.
+        values = {"name": user_vo.name}
+        if user_vo.password is not None:
+            values["password"] = user_vo.password
+
+        async with get_db_session() as db:
+            user = await update_returning(db, User, [User.id == user_vo.id], values)
 
             if not user:
                 raise HTTPException(status_code=422, detail="User not found")
-            
-            user.name = user_vo.name
-            user.password = user_vo.password
-            
-            await db.commit()
+
+            await commit(db)
 
         return UserVO(**row_to_dict(user))
     
-    async def get_users(self, page: int = 1, items_per_page: int = 10) -> tuple[int, list[UserVO]]:
-        async with AsyncSessionLocal() as db:
+    # window이면 COUNT(*) OVER()로 전체 개수와 페이지를 쿼리 한 번에 가져온다.
+    async def get_users(self, page: int = 1, items_per_page: int = 10, window: bool = False) -> tuple[int, list[UserVO]]:
+        if window:
+            async with get_db_session() as db:
+                query = (
+                    select(*user_mapper.columns, func.count().over().label("total_count"))
+                    .order_by(User.id)
+                    .offset((page - 1) * items_per_page)
+                    .limit(items_per_page)
+                )
+                rows = (await db.execute(query)).all()
+
+            # 마지막 페이지를 넘어가면 행이 없어 전체 개수를 알 수 없으므로 따로 센다.
+            if not rows and page > 1:
+                return await self.count_users(), []
+            total_count = rows[0].total_count if rows else 0
+            return total_count, user_mapper.all(row[:-1] for row in rows)
+
+        async with get_db_session() as db:
             total_count_query = select(func.count()).select_from(User)
             total_count_result = await db.execute(total_count_query)
             total_count = total_count_result.scalar()
 
             query = (
-                select(User)
+                select(*user_mapper.columns)
+                .order_by(User.id)
                 .offset((page -1) * items_per_page)
                 .limit(items_per_page)
             )
             
             result = await db.execute(query)                     # 몇 개의 데이터를 건너뛸지를 계산
-            users = result.scalars().all()    # limit로 페이지에 표시할 만큼만 조회한다.
+            users = user_mapper.all(result)    # limit로 페이지에 표시할 만큼만 조회한다.
+
+        return total_count, users
+
+    # 전체 개수 없이 페이지만 조회 (include_total=false인 경우)
+    async def get_users_page(self, offset: int, limit: int) -> list[UserVO]:
+        async with get_db_session() as db:
+            query = select(*user_mapper.columns).order_by(User.id).offset(offset).limit(limit)
+            result = await db.execute(query)
+            return user_mapper.all(result)
+
+    # 기본 키(id) 인덱스에서 after_id 다음부터 읽으므로 앞 페이지를 건너뛰는 비용이 없다.
+    async def get_users_after(self, after_id: str | None, limit: int) -> list[UserVO]:
+        async with get_db_session() as db:
+            query = select(*user_mapper.columns)
+            if after_id is not None:
+                query = query.where(User.id > after_id)
+            query = query.order_by(User.id).limit(limit)
 
-        return total_count, [UserVO(**row_to_dict(user)) for user in users]
+            result = await db.execute(query)
+            return user_mapper.all(result)
+
+    async def count_users(self) -> int:
+        async with get_db_session() as db:
+            result = await db.execute(select(func.count()).select_from(User))
+            return result.scalar()
         
     async def delete(self, id: str):
-        async with AsyncSessionLocal() as db:
-            query = select(User).where(User.id == id)
-            result = await db.execute(query)
-            user = result.scalars().first()
+        # 세션/과목/요약은 FK(ON DELETE CASCADE)로 DB가 지우므로 ORM으로 읽지 않고 DELETE 한 번으로 삭제한다.
+        async with get_db_session() as db:
+            result = await db.execute(delete(User).where(User.id == id))
 
-            if not user:
+            if not result.rowcount:
                 raise HTTPException(status_code=422, detail="User not found")
             
-            await db.delete(user)
-            await db.commit()
\ No newline at end of file
+            await commit(db)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr, Field
 from typing import Annotated
@@ -6,10 +6,14 @@ from dependency_injector.wiring import inject, Provide
 from containers import Container
 from datetime import datetime
 from common.auth import CurrentUser, get_current_user
+from common.responses import FastJSONResponse
+from config import get_settings
 
 from user.application.user_service import UserService
 
 
+settings = get_settings()
+
 router = APIRouter(prefix="/users")
 
 # 파이단틱 모델 선언(파이단틱의 BaseModel을 상속받는다.)
@@ -61,24 +65,55 @@ async def update_user(
 
     return user
 
+# 커서 방식에서는 page가 없고, 전체 개수를 세지 않으면 total_count도 없다.
 class GetUsersResponse(BaseModel):
-    total_count:int
-    page: int
+    total_count: int | None
+    page: int | None
     users: list[UserResponse]
+    next_cursor: str | None = None
 
+# cursor를 보내면 커서 방식(처음은 빈 값 cursor=), 없으면 page/offset 방식으로 조회한다.
 @router.get("")
 @inject
 async def get_users(
-    page: int = 1,
-    items_per_page: int = 10,
+    page: int = Query(1, ge=1),
+    items_per_page: int = Query(10, ge=1),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
+    include_total: bool | None = Query(None, description="전체 개수 조회 여부 (기본: page 방식은 true, 커서 방식은 false)"),
     user_service: UserService = Depends(Provide[Container.user_service])
 ) -> GetUsersResponse:
-    total_count, users = await user_service.get_users(page, items_per_page)
+    total_count, users, next_cursor = await user_service.get_users(
+        page = page,
+        items_per_page = items_per_page,
+        cursor = cursor,
+        include_total = include_total,
+    )
+    if cursor is not None:
+        page = None
+
+    # 비밀번호 등이 나가지 않도록 UserResponse 필드만 골라서 직렬화한다.
+    if settings.trusted_output:
+        return FastJSONResponse({
+            "total_count": total_count,
+            "page": page,
+            "users": [
+                {
+                    "id": user.id,
+                    "name": user.name,
+                    "email": user.email,
+                    "created_at": user.created_at,
+                    "updated_at": user.updated_at,
+                }
+                for user in users
+            ],
+            "next_cursor": next_cursor,
+        })
 
     return {
         "total_count": total_count,
         "page": page,
         "users": users,
+        "next_cursor": next_cursor,
     }
 
 # 204 No Content : 요청이 성공했으나 클라이언트가 현재 페이지에서 벗어나지 않아도 된다는 것을 나타냄
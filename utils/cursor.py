@@ -0,0 +1,23 @@
+import base64
+import binascii
+from fastapi import HTTPException
+
+# 커서 기반 페이지네이션의 next_cursor
+# 마지막으로 내려준 항목의 id(ULID, 생성 시간순으로 정렬됨)를 URL-safe base64로 감싼 불투명한 문자열이다.
+# 클라이언트는 내용을 해석하지 않고 그대로 다음 요청의 cursor로 보낸다.
+
+
+def encode_cursor(last_id: str) -> str:
+    return base64.urlsafe_b64encode(last_id.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not 1 <= len(last_id) <= 36:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
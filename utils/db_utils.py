@@ -1,23 +1,85 @@
-from sqlalchemy import inspect
+from dataclasses import fields
+from itertools import starmap
+from sqlalchemy import Float, inspect, type_coerce, update
+from sqlalchemy.future import select
 from sqlalchemy.orm import ColumnProperty
 from sqlalchemy.engine.row import Row
 from datetime import datetime
 
+# 모델 클래스별 컬럼 속성 이름 (mapper.iterate_properties는 클래스마다 한 번만 순회한다)
+_column_keys: dict[type, tuple[str, ...]] = {}
+
+
+def _model_keys(model: type) -> tuple[str, ...]:
+    keys = _column_keys.get(model)
+    if keys is None:
+        keys = _column_keys[model] = tuple(
+            prop.key for prop in inspect(model).iterate_properties if isinstance(prop, ColumnProperty)
+        )
+    return keys
+
+
 def row_to_dict(row) -> dict:
-    if isinstance(row, Row):
-        # Row 객체인 경우 (result set에서 바로 가져온 경우)
+    if isinstance(row, (Row, dict)):
+        # Row 객체인 경우 (result set에서 바로 가져온 경우) 또는 컬럼명 -> 값 dict인 경우
+        mapping = row._mapping if isinstance(row, Row) else row
         return {
             key: value.isoformat() if isinstance(value, datetime) else value
-            for key, value in row._mapping.items()
+            for key, value in mapping.items()
         }
     else:
         # SQLAlchemy 모델 인스턴스인 경우
         result = {}
-        for prop in inspect(row).mapper.iterate_properties:
-            if isinstance(prop, ColumnProperty):
-                value = getattr(row, prop.key)
-                if isinstance(value, datetime):
-                    result[prop.key] = value.isoformat()  # 명시적 ISO 8601 변환
-                else:
-                    result[prop.key] = value
-        return result
\ No newline at end of file
+        for key in _model_keys(type(row)):
+            value = getattr(row, key)
+            if isinstance(value, datetime):
+                result[key] = value.isoformat()  # 명시적 ISO 8601 변환
+            else:
+                result[key] = value
+        return result
+
+
+class RowMapper:
+    """
+    Core 결과 행(튜플)을 도메인 dataclass로 바로 만드는 변환기 (ORM 객체, dict를 거치지 않는다)
+    dataclass 필드 순서대로 모델의 컬럼을 한 번만 골라 두고 select(*mapper.columns)로 조회한 행을 위치 인자로 넘긴다.
+    - datetime은 ISO 문자열로 바꾸지 않고 그대로 둔다. (응답 직렬화에서 한 번만 변환)
+    - float_fetch이면 Float(asdecimal=True) 컬럼을 Decimal로 바꾸지 않고 드라이버가 준 float 그대로 받는다.
+    """
+
+    def __init__(self, domain_cls: type, model: type, float_fetch: bool = True):
+        table = model.__table__
+        self.domain_cls = domain_cls
+        self.columns = [_fetch_column(table.c[field.name], float_fetch) for field in fields(domain_cls)]
+
+    def one(self, row):
+        return self.domain_cls(*row)
+
+    def all(self, rows) -> list:
+        return list(starmap(self.domain_cls, rows))
+
+
+def _fetch_column(column, float_fetch: bool):
+    if float_fetch and isinstance(column.type, Float) and column.type.asdecimal:
+        return type_coerce(column, Float(asdecimal=False)).label(column.key)
+    return column
+
+
+# UPDATE 한 번으로 where에 맞는 행을 수정하고 수정된 행(columns)을 반환한다. 대상이 없으면 None.
+# RETURNING을 지원하는 DB는 같은 문장에서 행을 돌려받고, 지원하지 않는 DB(MySQL)는
+# rowcount로 대상 유무를 확인한 뒤 필요한 컬럼만 Core로 다시 읽는다. (ORM 객체를 만들지 않음)
+# MySQL 드라이버는 FOUND_ROWS 플래그로 연결되므로 rowcount는 값이 바뀌지 않은 행도 포함한다.
+async def update_returning(db, model, where: list, values: dict, columns: list | None = None) -> Row | None:
+    columns = columns or list(model.__table__.c)
+    statement = update(model).where(*where).values(**values)
+
+    if db.get_bind().dialect.update_returning:
+        result = await db.execute(statement.returning(*columns))
+        return result.first()
+
+    result = await db.execute(statement)
+    if not result.rowcount:
+        return None
+
+    result = await db.execute(select(*columns).where(*where))
+    return result.first()
@@ -0,0 +1,59 @@
+import os
+import time
+
+# Crockford Base32 (ULID 표준 인코딩)
+ENCODING = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# 10비트(문자 2개) 단위 인코딩 표
+_PAIRS = [high + low for high in ENCODING for low in ENCODING]
+
+_LOW_BITS = 20
+_LOW_MASK = (1 << _LOW_BITS) - 1
+
+
+def _encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        chars.append(ENCODING[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class ULIDAllocator:
+    """
+    ULID를 한 번에 여러 개 발급한다.
+    같은 밀리초 안에서는 랜덤 부분을 1씩 증가시켜 발급 순서대로 정렬되는(monotonic) id를 만든다.
+    타임스탬프와 랜덤 상위 비트는 묶음마다 한 번만 인코딩하고 하위 20비트만 표에서 찾아 붙인다.
+    """
+
+    def __init__(self):
+        self._last_ms = -1
+        self._last_random = 0
+
+    def allocate(self, count: int) -> list[str]:
+        ms = time.time_ns() // 1_000_000
+        if ms > self._last_ms:
+            # 최상위 비트를 비워 두어 같은 밀리초 안에서 증가해도 80비트를 넘지 않게 한다.
+            random = int.from_bytes(os.urandom(10), "big") >> 1
+        else:
+            ms = self._last_ms
+            random = self._last_random + 1
+
+        timestamp = _encode(ms, 10)
+        ids: list[str] = []
+        remaining = count
+        while remaining > 0:
+            low = random & _LOW_MASK
+            take = min(remaining, _LOW_MASK + 1 - low)
+            prefix = timestamp + _encode(random >> _LOW_BITS, 12)
+            ids.extend([prefix + _PAIRS[value >> 10] + _PAIRS[value & 0x3FF] for value in range(low, low + take)])
+            random += take
+            remaining -= take
+
+        self._last_ms = ms
+        self._last_random = random - 1
+
+        return ids
+
+
+# 프로세스 전체에서 공유해야 요청이 달라도 순서가 유지된다.
+ulid_allocator = ULIDAllocator()